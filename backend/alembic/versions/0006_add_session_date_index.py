@@ -0,0 +1,24 @@
+"""Add composite (date, id) index for session pagination
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Backs (date DESC, id DESC) keyset pagination and from/to filters
+    op.create_index('idx_workoutsession_date_id', 'api_workoutsession', ['date', 'id'])
+
+
+def downgrade():
+    op.drop_index('idx_workoutsession_date_id', table_name='api_workoutsession')
@@ -0,0 +1,120 @@
+"""Add typed numeric/duration metric columns to api_workoutset
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Frozen copy of app.metric_values as of this revision: migrations must not
+# change behaviour when the live parser does
+DURATION_UNITS = {
+    "s": 1, "sec": 1, "secs": 1, "second": 1, "seconds": 1,
+    "min": 60, "mins": 60, "minute": 60, "minutes": 60,
+    "h": 3600, "hr": 3600, "hrs": 3600, "hour": 3600, "hours": 3600,
+}
+
+
+def _parse_number(value):
+    if value is None:
+        return None
+    value = value.strip()
+    if ":" in value:
+        seconds = 0.0
+        for part in value.split(":"):
+            try:
+                seconds = seconds * 60 + float(part)
+            except ValueError:
+                return None
+        return seconds
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _parse_duration(value, unit):
+    if value is None:
+        return None
+    if ":" in value:
+        return _parse_number(value)
+    factor = DURATION_UNITS.get((unit or "").strip().lower())
+    number = _parse_number(value)
+    if factor is None or number is None:
+        return None
+    return number * factor
+
+
+def _typed_columns(row):
+    """(id, metric1_num, metric2_num, metric3_num, duration_seconds) for one set row."""
+    duration = None
+    numbers = []
+    for n in (1, 2, 3):
+        value, unit = row[f"metric{n}_value"], row[f"metric{n}_unit"]
+        numbers.append(_parse_number(value))
+        if duration is None:
+            duration = _parse_duration(value, unit)
+    return (row["id"], *numbers, duration)
+
+
+def upgrade():
+    op.add_column('api_workoutset', sa.Column('metric1_num', sa.Float(), nullable=True))
+    op.add_column('api_workoutset', sa.Column('metric2_num', sa.Float(), nullable=True))
+    op.add_column('api_workoutset', sa.Column('metric3_num', sa.Float(), nullable=True))
+    op.add_column('api_workoutset', sa.Column('duration_seconds', sa.Float(), nullable=True))
+
+    # Backfill in id-ordered batches, one UPDATE ... FROM (VALUES ...) per batch
+    conn = op.get_bind()
+    select_batch = sa.text("""
+        SELECT id, metric1_value, metric1_unit, metric2_value, metric2_unit,
+               metric3_value, metric3_unit
+        FROM api_workoutset
+        WHERE id > :last_id
+        ORDER BY id
+        LIMIT :batch_size
+    """)
+    workoutset = sa.table(
+        'api_workoutset',
+        sa.column('id', sa.Integer), sa.column('metric1_num', sa.Float),
+        sa.column('metric2_num', sa.Float), sa.column('metric3_num', sa.Float),
+        sa.column('duration_seconds', sa.Float),
+    )
+    typed_names = ['metric1_num', 'metric2_num', 'metric3_num', 'duration_seconds']
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select_batch, {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE}
+        ).mappings().all()
+        if not rows:
+            break
+        parsed = sa.values(
+            sa.column('id', sa.Integer), *(sa.column(name, sa.Float) for name in typed_names),
+            name='parsed',
+        ).data([_typed_columns(row) for row in rows])
+        conn.execute(
+            workoutset.update()
+            .where(workoutset.c.id == parsed.c.id)
+            # An all-NULL VALUES column is typed text; cast it back
+            .values({name: sa.cast(parsed.c[name], sa.Float) for name in typed_names})
+        )
+        last_id = rows[-1]["id"]
+
+    op.create_index('idx_workoutset_exercise_metric1', 'api_workoutset', ['exercise_id', 'metric1_num'])
+
+
+def downgrade():
+    op.drop_index('idx_workoutset_exercise_metric1', table_name='api_workoutset')
+    op.drop_column('api_workoutset', 'duration_seconds')
+    op.drop_column('api_workoutset', 'metric3_num')
+    op.drop_column('api_workoutset', 'metric2_num')
+    op.drop_column('api_workoutset', 'metric1_num')
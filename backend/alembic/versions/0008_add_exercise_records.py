@@ -0,0 +1,64 @@
+"""Add api_exercise_record personal-record table
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of app.records.RECORD_TYPES as of this revision:
+# record_type -> (category types it applies to, value expression over ws)
+RECORD_TYPES = {
+    "max_weight": (("strength",), "ws.metric1_num"),
+    "max_reps": (("strength", "flexibility"), "ws.metric2_num"),
+    "max_e1rm": (("strength",), (
+        "CASE WHEN ws.metric2_num = 1 THEN ws.metric1_num"
+        " WHEN ws.metric2_num > 1 THEN ws.metric1_num * (1 + ws.metric2_num / 30.0) END"
+    )),
+    "max_set_volume": (("strength",), "ws.metric1_num * ws.metric2_num"),
+    "max_distance": (("cardio",), "ws.metric2_num"),
+    "longest_duration": (("cardio", "flexibility", "recovery"), "ws.duration_seconds"),
+}
+
+
+def upgrade():
+    op.create_table(
+        'api_exercise_record',
+        sa.Column('id', sa.Integer(), primary_key=True, index=True),
+        sa.Column('exercise_id', sa.Integer(), sa.ForeignKey('api_exercise.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('record_type', sa.String(30), nullable=False),
+        sa.Column('value', sa.Float(), nullable=False),
+        sa.Column('set_id', sa.Integer(), sa.ForeignKey('api_workoutset.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('session_id', sa.Integer(), sa.ForeignKey('api_workoutsession.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('achieved_on', sa.Date(), nullable=False),
+        sa.UniqueConstraint('exercise_id', 'record_type', name='uq_exercise_record_type'),
+    )
+
+    # Backfill from existing history: best set per exercise, ties to the earliest
+    for record_type, (category_types, value) in RECORD_TYPES.items():
+        op.get_bind().execute(
+            sa.text(f"""
+                INSERT INTO api_exercise_record
+                    (exercise_id, record_type, value, set_id, session_id, achieved_on)
+                SELECT DISTINCT ON (ws.exercise_id)
+                    ws.exercise_id, :record_type, {value}, ws.id, s.id, s.date
+                FROM api_workoutset ws
+                JOIN api_workoutsession s ON s.id = ws.session_id
+                JOIN api_exercise e ON e.id = ws.exercise_id
+                WHERE e.category_type IN :category_types AND ({value}) IS NOT NULL
+                ORDER BY ws.exercise_id, {value} DESC, s.date, ws.id
+            """).bindparams(sa.bindparam('category_types', expanding=True)),
+            {"record_type": record_type, "category_types": list(category_types)},
+        )
+
+
+def downgrade():
+    op.drop_table('api_exercise_record')
@@ -0,0 +1,25 @@
+"""Add api_workoutset indexes for latest-sets and per-session lookups
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('idx_workoutset_exercise_session', 'api_workoutset', ['exercise_id', 'session_id'])
+    op.create_index('idx_workoutset_session', 'api_workoutset', ['session_id'])
+
+
+def downgrade():
+    op.drop_index('idx_workoutset_session', table_name='api_workoutset')
+    op.drop_index('idx_workoutset_exercise_session', table_name='api_workoutset')
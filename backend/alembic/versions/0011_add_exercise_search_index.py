@@ -0,0 +1,45 @@
+"""Add api_exercise.last_used_on and a pg_trgm index on exercise names
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('api_exercise', sa.Column('last_used_on', sa.Date(), nullable=True))
+    op.execute("""
+        UPDATE api_exercise e
+        SET last_used_on = used.last_used_on
+        FROM (
+            SELECT ws.exercise_id, MAX(s.date) AS last_used_on
+            FROM api_workoutset ws
+            JOIN api_workoutsession s ON s.id = ws.session_id
+            GROUP BY ws.exercise_id
+        ) used
+        WHERE e.id = used.exercise_id
+    """)
+
+    # pg_trgm ships with PostgreSQL's contrib modules; without it, exercise
+    # search falls back to an in-process index
+    available = op.get_bind().scalar(
+        sa.text("SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')")
+    )
+    if available:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX idx_exercise_name_trgm ON api_exercise USING gin (lower(name) gin_trgm_ops)")
+
+
+def downgrade():
+    # The extension is left installed: other objects may depend on it
+    op.execute("DROP INDEX IF EXISTS idx_exercise_name_trgm")
+    op.drop_column('api_exercise', 'last_used_on')
@@ -0,0 +1,184 @@
+"""Response cache for derived read endpoints.
+
+Decorate a router function with @cached(ResponseModel, tags=(...)) to
+cache its serialized JSON. Tags are resource names from app.versions and
+their current versions are part of every cache key, so a write to a tagged
+resource (bump_versions) invalidates its entries in every worker and in a
+shared backend without explicit deletes; stale entries age out by LRU/TTL.
+
+Backend is chosen with CACHE_BACKEND=memory (default), redis or none.
+"""
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.profiling import phase
+from app.versions import current_versions
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+
+class MemoryBackend:
+    """Thread-safe LRU with entry-count, total-size and TTL limits."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._size -= len(value)
+
+
+class RedisBackend:
+    """Backend for any Redis-protocol server, through a redis-py style client.
+
+    Entries expire by TTL; size limits are left to the server's maxmemory
+    policy (e.g. allkeys-lru).
+    """
+
+    def __init__(self, client, ttl: float, prefix: str = "smart_logger:cache:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self.client.set(self.prefix + key, value, px=int(self.ttl * 1000))
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+class NullBackend:
+    """Backend that stores nothing (caching disabled)."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, key: str, value: bytes) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+def create_backend(name: str = CACHE_BACKEND):
+    """Build the configured cache backend."""
+    if name == "none":
+        return NullBackend()
+    if name == "redis":
+        import redis  # Optional dependency, only needed for CACHE_BACKEND=redis
+
+        return RedisBackend(redis.Redis.from_url(CACHE_REDIS_URL), CACHE_TTL_SECONDS)
+    return MemoryBackend(CACHE_MAX_ENTRIES, CACHE_MAX_BYTES, CACHE_TTL_SECONDS)
+
+
+backend = create_backend()
+
+# Per-function hit/miss counters
+stats: dict[str, dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str, outcome: str) -> None:
+    with _stats_lock:
+        counters = stats.setdefault(name, {"hits": 0, "misses": 0})
+        counters[outcome] += 1
+
+
+def _cache_key(name: str, tags: tuple[str, ...], kwargs: dict[str, Any]) -> str:
+    """Key from function name, non-session arguments and tag versions.
+
+    Versions are reloaded through the request's own session if needed, so in
+    async mode (db_endpoint) the reload goes through asyncpg instead of
+    blocking the event loop on the sync engine.
+    """
+    sessions = [v for v in kwargs.values() if isinstance(v, Session)]
+    versions = current_versions(sessions[0] if sessions else None)
+    arguments = {k: v for k, v in kwargs.items() if not isinstance(v, Session)}
+    raw = json.dumps(
+        [name, jsonable_encoder(arguments), [versions[tag] for tag in tags]],
+        sort_keys=True,
+    )
+    return name + ":" + hashlib.sha256(raw.encode()).hexdigest()
+
+
+def cached(response_model: Any, tags: tuple[str, ...]) -> Callable:
+    """Cache a sync router function's JSON response, keyed by its arguments.
+
+    response_model serializes the function's return value (ORM objects
+    included). Responses are returned as raw JSON bytes on hits and misses
+    alike; HTTP errors are not cached.
+    """
+    adapter = TypeAdapter(response_model)
+
+    def decorator(func: Callable) -> Callable:
+        name = f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(**kwargs):
+            key = _cache_key(name, tags, kwargs)
+            body = backend.get(key)
+            if body is None:
+                _count(name, "misses")
+                result = func(**kwargs)
+                with phase("serialize"):
+                    body = adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+                backend.set(key, body)
+            else:
+                _count(name, "hits")
+            return Response(content=body, media_type="application/json")
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,75 @@
+"""In-process exercise catalog with pre-serialized responses.
+
+The catalog is loaded with one query and then served from memory: lookups
+by id or name and the ExerciseRead JSON bytes cost no DB round trips. It is
+dropped whenever the exercises resource changes (see app.versions), in this
+worker right after commit and in other workers via LISTEN/NOTIFY.
+"""
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.exercise_search import ExerciseSearchIndex
+from app.models import Exercise
+from app.schemas import ExerciseRead
+from app.versions import EXERCISES, on_change
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable view of the exercise catalog at load time."""
+    by_id: dict[int, ExerciseRead]
+    id_by_name: dict[str, int]
+    item_json: dict[int, bytes]
+    list_json: bytes
+
+    @cached_property
+    def search_index(self) -> ExerciseSearchIndex:
+        """Name search index, built on first use for this snapshot."""
+        return ExerciseSearchIndex(self.by_id.values())
+
+
+class ExerciseCatalog:
+    """Lazily loaded, invalidation-driven exercise catalog."""
+
+    def __init__(self):
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Drop the cached catalog; the next read reloads it."""
+        with self._lock:
+            self._snapshot = None
+            self._generation += 1
+
+    def snapshot(self, db: Session) -> CatalogSnapshot:
+        """Return the cached catalog, loading it if needed."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        generation = self._generation
+        exercises = [
+            ExerciseRead.model_validate(e)
+            for e in db.query(Exercise).order_by(Exercise.name).all()
+        ]
+        item_json = {e.id: e.model_dump_json().encode() for e in exercises}
+        snapshot = CatalogSnapshot(
+            by_id={e.id: e for e in exercises},
+            id_by_name={e.name: e.id for e in exercises},
+            item_json=item_json,
+            list_json=b"[" + b",".join(item_json[e.id] for e in exercises) + b"]",
+        )
+        with self._lock:
+            # Don't cache a load that raced with an invalidation
+            if generation == self._generation:
+                self._snapshot = snapshot
+        return snapshot
+
+
+catalog = ExerciseCatalog()
+on_change(EXERCISES, catalog.invalidate)
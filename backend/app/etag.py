@@ -0,0 +1,78 @@
+"""Strong ETag helpers and middleware for conditional GET responses."""
+import hashlib
+
+from fastapi import Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.versions import EXERCISES, SESSIONS, TEMPLATES, current_versions
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match header matches the given ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the ETag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+# Route prefix -> resources whose data its GET responses depend on
+ROUTE_RESOURCES = (
+    ("/api/exercises", (EXERCISES, SESSIONS)),
+    ("/api/sessions", (SESSIONS, EXERCISES)),
+    ("/api/templates", (TEMPLATES, EXERCISES)),
+    ("/api/stats", (SESSIONS,)),
+)
+
+
+def _route_resources(path: str) -> tuple[str, ...]:
+    """Resources a GET path depends on (empty if not version-tracked)."""
+    for prefix, resources in ROUTE_RESOURCES:
+        if path == prefix or path.startswith(prefix + "/"):
+            return resources
+    return ()
+
+
+def version_etag(request: Request, resources: tuple[str, ...], versions: dict[str, int]) -> str:
+    """Strong ETag for a GET from its URL, Accept header and resource versions."""
+    key = "|".join(
+        [request.url.path, request.url.query, request.headers.get("accept", "")]
+        + [f"{resource}={versions[resource]}" for resource in resources]
+    )
+    return make_etag(key.encode())
+
+
+class ConditionalGetMiddleware(BaseHTTPMiddleware):
+    """Answer If-None-Match from resource versions, before any ORM work.
+
+    Versions are cached in memory between change notifications and read
+    before the handler runs, so a response can only be newer than its ETag,
+    never older; a concurrent write at worst costs one extra refetch.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        resources = _route_resources(request.url.path)
+        if request.method != "GET" or not resources:
+            return await call_next(request)
+
+        versions = await run_in_threadpool(current_versions)
+        etag = version_etag(request, resources, versions)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        response = await call_next(request)
+        if response.status_code == status.HTTP_200_OK and "etag" not in response.headers:
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "no-cache"
+        return response
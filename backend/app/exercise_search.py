@@ -0,0 +1,397 @@
+"""Ranked exercise search, and the last-used dates it ranks by.
+
+Ranking is by match tier (exact, name prefix, word prefix, substring,
+fuzzy), then by how recently the exercise was logged, then by trigram
+similarity and name. Queries shorter than three characters only match name
+and word prefixes.
+
+With the pg_trgm extension installed (migration 0011), a search is one
+statement served by the GIN trigram index on lower(name). Without it, the
+same ranking runs over an in-process trigram and prefix index built from
+the catalog snapshot.
+
+Recency is measured from the newest logged session, not the clock, so
+results only change when the data does (and stay valid under the version
+ETags). Each exercise's last-used date is kept in api_exercise.last_used_on
+by the session write paths, like personal records (see app.records).
+"""
+import datetime
+import heapq
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from itertools import chain
+from dataclasses import dataclass
+from math import ceil
+from typing import Iterable, Optional
+
+from sqlalchemy import (
+    ARRAY, Integer, Numeric, any_, bindparam, case, cast, exists, func, or_, select, text, update,
+)
+from sqlalchemy.orm import Session
+
+from app.models import Exercise, WorkoutSession, WorkoutSet
+from app.schemas import ExerciseRead
+from app.versions import SESSIONS, on_change
+
+# Lowest trigram similarity still returned as a fuzzy match; pg_trgm's `%`
+# operator uses its similarity_threshold setting, which defaults to the same
+SIMILARITY_THRESHOLD = 0.3
+
+# Recency boosts: logged within 14 days of the newest session, within 90, ever
+RECENT_DAYS = (14, 90)
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse everything but letters and digits to single spaces."""
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def trigrams(normalized: str) -> set[str]:
+    """pg_trgm-style trigrams of an already normalized string."""
+    grams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _prefix_range(keys: list[str], prefix: str) -> tuple[int, int]:
+    """Slice bounds of the entries of sorted keys starting with prefix."""
+    return bisect_left(keys, prefix), bisect_left(keys, prefix + "\uffff")
+
+
+@dataclass(frozen=True)
+class ExerciseUsage:
+    """Recency boost per logged exercise (see RECENT_DAYS); unlogged ones get 0."""
+    recency: dict[int, int]
+
+    @classmethod
+    def from_last_used(cls, last_used: dict[int, datetime.date]) -> "ExerciseUsage":
+        latest = max(last_used.values(), default=None)
+        return cls(recency={
+            exercise_id: 1 + sum((latest - used).days <= days for days in RECENT_DAYS)
+            for exercise_id, used in last_used.items()
+        })
+
+
+class ExerciseSearchIndex:
+    """Trigram and prefix index over one catalog snapshot's exercise names."""
+
+    def __init__(self, exercises: Iterable[ExerciseRead]):
+        self.exercises: dict[int, ExerciseRead] = {}
+        self.names: dict[int, str] = {}
+        self.gram_counts: dict[int, int] = {}
+        self.postings: dict[str, list[int]] = defaultdict(list)
+        name_entries = []
+        word_entries = []
+        for exercise in exercises:
+            exercise_id = exercise.id
+            name = normalize(exercise.name)
+            grams = trigrams(name)
+            self.exercises[exercise_id] = exercise
+            self.names[exercise_id] = name
+            self.gram_counts[exercise_id] = len(grams)
+            for gram in grams:
+                self.postings[gram].append(exercise_id)
+            name_entries.append((name, exercise_id))
+            word_entries.extend((word, exercise_id) for word in set(name.split()))
+        self.postings = dict(self.postings)
+        name_entries.sort()
+        word_entries.sort()
+        self._name_keys = [name for name, _ in name_entries]
+        self._name_ids = [exercise_id for _, exercise_id in name_entries]
+        self._word_keys = [word for word, _ in word_entries]
+        self._word_ids = [exercise_id for _, exercise_id in word_entries]
+
+    def _name_prefix_ids(self, query: str) -> list[int]:
+        start, end = _prefix_range(self._name_keys, query)
+        return self._name_ids[start:end]
+
+    def _word_prefix_ids(self, query: str) -> list[int]:
+        """Names with a word starting with query (multi-word queries match across words)."""
+        start, end = _prefix_range(self._word_keys, query.split(" ", 1)[0])
+        ids = self._word_ids[start:end]
+        if " " in query:
+            needle = f" {query}"
+            ids = [i for i in ids if needle in f" {self.names[i]}"]
+        return ids
+
+    def _shared_trigrams(self, query_grams: set[str]) -> dict[int, int]:
+        """Names sharing enough trigrams with the query to be a substring or fuzzy match."""
+        counts = Counter()
+        for gram in query_grams:
+            counts.update(self.postings.get(gram, ()))
+        # A fuzzy match shares at least threshold * |query trigrams|; a
+        # substring match shares at least the query's unpadded trigrams
+        needed = max(1, min(
+            ceil(SIMILARITY_THRESHOLD * len(query_grams)),
+            sum(1 for gram in query_grams if " " not in gram),
+        ))
+        return {exercise_id: shared for exercise_id, shared in counts.items() if shared >= needed}
+
+    def search(
+        self,
+        q: str,
+        usage: ExerciseUsage,
+        categories: Optional[list[str]] = None,
+        category_types: Optional[list[str]] = None,
+        limit: int = 20,
+    ) -> list[int]:
+        """Ids of the best matches for q, best first.
+
+        Tiers are searched best first and later tiers are skipped once
+        limit results are found. An empty query lists the (filtered)
+        catalog by recent use, then name.
+        """
+        query = normalize(q)
+        recency = usage.recency
+        names = self.names
+        seen: set[int] = set()
+
+        def allowed(exercise_id) -> bool:
+            exercise = self.exercises.get(exercise_id)
+            return (
+                exercise is not None
+                and (not categories or exercise.category in categories)
+                and (not category_types or exercise.category_type in category_types)
+            )
+
+        def take(ids, key) -> list[int]:
+            """Best unseen ids passing the filters, ordered by key."""
+            fresh = [i for i in ids if i not in seen and allowed(i)]
+            seen.update(fresh)
+            return heapq.nsmallest(limit - len(results), fresh, key=key)
+
+        def by_recency(exercise_id):
+            # Shorter names are closer to a prefix query
+            name = names[exercise_id]
+            return name != query, -recency.get(exercise_id, 0), len(name), name
+
+        results: list[int] = []
+        if not query:
+            # Logged exercises by recency, then the rest by name: stop at limit
+            ordered = chain(
+                sorted(recency, key=lambda i: (-recency[i], names.get(i, ""))),
+                self._name_ids,
+            )
+            for exercise_id in ordered:
+                if exercise_id not in seen and allowed(exercise_id):
+                    seen.add(exercise_id)
+                    results.append(exercise_id)
+                    if len(results) == limit:
+                        break
+            return results
+        results += take(self._name_prefix_ids(query), by_recency)
+        if len(results) < limit:
+            results += take(self._word_prefix_ids(query), by_recency)
+        if len(results) < limit and len(query) >= 3:
+            query_grams = trigrams(query)
+            shared = self._shared_trigrams(query_grams)
+            similarity = {
+                exercise_id: count / (len(query_grams) + self.gram_counts[exercise_id] - count)
+                for exercise_id, count in shared.items()
+            }
+            results += take((i for i in shared if query in names[i]), by_recency)
+            if len(results) < limit:
+                fuzzy = (i for i, sim in similarity.items() if sim >= SIMILARITY_THRESHOLD)
+                # Similarity in steps of 0.1 first, so recency only reorders close matches
+                results += take(fuzzy, lambda i: (
+                    -round(similarity[i], 1), -recency.get(i, 0), -similarity[i], names[i]
+                ))
+        return results
+
+
+class LastUsedDates:
+    """Lazily loaded ExerciseUsage for the in-process index, dropped on session writes."""
+
+    def __init__(self):
+        self._usage: Optional[ExerciseUsage] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Drop the cached usage; the next read reloads it."""
+        with self._lock:
+            self._usage = None
+            self._generation += 1
+
+    def get(self, db: Session) -> ExerciseUsage:
+        """Return the cached usage, loading it if needed."""
+        usage = self._usage
+        if usage is not None:
+            return usage
+
+        generation = self._generation
+        rows = db.execute(
+            select(Exercise.id, Exercise.last_used_on).where(Exercise.last_used_on.isnot(None))
+        )
+        usage = ExerciseUsage.from_last_used(dict(rows.all()))
+        with self._lock:
+            # Don't cache a load that raced with an invalidation
+            if generation == self._generation:
+                self._usage = usage
+        return usage
+
+
+exercise_usage = LastUsedDates()
+on_change(SESSIONS, exercise_usage.invalidate)
+
+# Whether pg_trgm is installed, checked on the first search of each process
+_pg_trgm_installed: Optional[bool] = None
+
+
+def pg_trgm_installed(db: Session) -> bool:
+    """Whether searches can use pg_trgm and its GIN index."""
+    global _pg_trgm_installed
+    if _pg_trgm_installed is None:
+        _pg_trgm_installed = db.scalar(
+            text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        )
+    return _pg_trgm_installed
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_query(
+    q: str,
+    exercise_ids: Iterable[int],
+    categories: Optional[list[str]],
+    category_types: Optional[list[str]],
+    limit: int,
+):
+    """Select the ids of the best matches for q with pg_trgm, best first.
+
+    Only ids in exercise_ids are considered, passed as one array parameter.
+    """
+    query = " ".join(q.lower().split())
+    name = func.lower(Exercise.name)
+
+    # Days between an exercise's last use and the newest logged session
+    newest_logged = (
+        select(WorkoutSession.date)
+        .where(exists().where(WorkoutSet.session_id == WorkoutSession.id))
+        .order_by(WorkoutSession.date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    days_unused = newest_logged - Exercise.last_used_on
+    # Same boosts as ExerciseUsage
+    recency = case(
+        (Exercise.last_used_on.is_(None), 0),
+        (days_unused <= RECENT_DAYS[0], 3),
+        (days_unused <= RECENT_DAYS[1], 2),
+        else_=1,
+    )
+
+    known = bindparam("exercise_ids", list(exercise_ids), type_=ARRAY(Integer))
+    stmt = select(Exercise.id).where(Exercise.id == any_(known)).limit(limit)
+    if categories:
+        stmt = stmt.where(Exercise.category.in_(categories))
+    if category_types:
+        stmt = stmt.where(Exercise.category_type.in_(category_types))
+    if not query:
+        return stmt.order_by(recency.desc(), name)
+
+    pattern = _like_escape(query)
+    prefix, word_prefix, substring = f"{pattern}%", f"% {pattern}%", f"%{pattern}%"
+    tier = case(
+        (name == query, 0),
+        (name.like(prefix), 1),
+        (name.like(word_prefix), 2),
+        (name.like(substring), 3),
+        else_=4,
+    )
+    similarity = func.similarity(name, query)
+    if len(query) < 3:
+        stmt = stmt.where(or_(name.like(prefix), name.like(word_prefix)))
+    else:
+        # Prefixes are substrings too; both operators are served by the GIN index
+        stmt = stmt.where(or_(name.like(substring), name.op("%")(query)))
+    return stmt.order_by(
+        tier,
+        # Fuzzy matches: similarity in steps of 0.1 first, so recency only
+        # reorders close matches
+        case((tier == 4, func.round(cast(similarity, Numeric), 1)), else_=0).desc(),
+        recency.desc(),
+        # Shorter names are closer to a prefix query
+        case((tier == 4, -similarity), else_=func.length(name)),
+        name,
+    )
+
+
+def search_exercise_ids(
+    db: Session,
+    snapshot,
+    q: str,
+    categories: Optional[list[str]] = None,
+    category_types: Optional[list[str]] = None,
+    limit: int = 20,
+) -> list[int]:
+    """Ids of the best matches for q, best first.
+
+    Uses pg_trgm when installed, else the in-process index of snapshot (the
+    app.catalog snapshot the rows will be served from). An empty query lists
+    the (filtered) catalog by recent use, then name.
+    """
+    if pg_trgm_installed(db):
+        # Skip exercises created since the snapshot was loaded (they are
+        # served once this worker sees the change) before the limit applies
+        return list(db.scalars(_search_query(q, snapshot.by_id, categories, category_types, limit)))
+    return snapshot.search_index.search(
+        q, exercise_usage.get(db), categories, category_types, limit
+    )
+
+
+def update_last_used_for_sessions(db: Session, session_ids: list[int]) -> None:
+    """Fold newly inserted sessions' dates into their exercises' last-used dates."""
+    if not session_ids:
+        return
+    used = (
+        select(WorkoutSet.exercise_id, func.max(WorkoutSession.date).label("last_used_on"))
+        .join(WorkoutSession, WorkoutSession.id == WorkoutSet.session_id)
+        .where(WorkoutSet.session_id.in_(session_ids))
+        .group_by(WorkoutSet.exercise_id)
+        .subquery()
+    )
+    db.execute(
+        update(Exercise)
+        .where(
+            Exercise.id == used.c.exercise_id,
+            or_(Exercise.last_used_on.is_(None), Exercise.last_used_on < used.c.last_used_on),
+        )
+        .values(last_used_on=used.c.last_used_on)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebuild_last_used(db: Session, exercise_ids) -> None:
+    """Recompute last-used dates from history for the given exercises.
+
+    exercise_ids is a list of ids or a select of them. Used when a session
+    is deleted or moved to another date, which can make a date older. Each
+    date is the latest session's, found like the latest-sets lookups by
+    walking sessions newest first; the EXISTS probe skips that walk for
+    exercises with no sets left.
+    """
+    latest_date = (
+        select(WorkoutSession.date)
+        .join(WorkoutSet, WorkoutSet.session_id == WorkoutSession.id)
+        .where(WorkoutSet.exercise_id == Exercise.id)
+        .order_by(WorkoutSession.date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(Exercise)
+        .where(Exercise.id.in_(exercise_ids))
+        .values(last_used_on=case(
+            (exists().where(WorkoutSet.exercise_id == Exercise.id), latest_date),
+        ))
+        .execution_options(synchronize_session=False)
+    )
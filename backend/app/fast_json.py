@@ -0,0 +1,79 @@
+"""Single-pass JSON responses for large read payloads.
+
+Routes named in FAST_JSON_ROUTES build plain dicts straight from Core rows
+and return them encoded in one pass. This skips ORM hydration, the
+response_model re-validation and jsonable_encoder. The rows already carry
+the declared types, so the bytes match the validated path. orjson is used
+when installed; otherwise pydantic_core.to_json, which ships with pydantic.
+
+negotiated_response() also offers MessagePack, when msgpack is installed,
+to clients that ask for it in their Accept header.
+"""
+import os
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic_core import to_json
+
+from app.profiling import phase
+
+try:
+    import orjson  # Optional dependency, faster for large payloads
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # Optional dependency, enables MessagePack responses
+except ImportError:
+    msgpack = None
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Comma-separated endpoint names, "all" or "none"
+FAST_JSON_ROUTES = {
+    name.strip()
+    for name in os.getenv("FAST_JSON_ROUTES", "list_sessions,get_session").split(",")
+    if name.strip()
+}
+
+
+def enabled(route: str) -> bool:
+    """Whether the endpoint named route serves the fast path."""
+    return route in FAST_JSON_ROUTES or "all" in FAST_JSON_ROUTES
+
+
+def dumps(payload: Any) -> bytes:
+    """Encode dicts, lists, dates and datetimes as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_UTC_Z)
+    return to_json(payload)
+
+
+def json_response(payload: Any, headers: Optional[dict[str, str]] = None) -> Response:
+    """JSON response for an already-shaped payload (no response_model pass)."""
+    with phase("encode"):
+        body = dumps(payload)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def wants_msgpack(accept: Optional[str]) -> bool:
+    """Whether the Accept header asks for MessagePack and it can be produced."""
+    if msgpack is None or not accept:
+        return False
+    return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def negotiated_response(
+    payload: Any, accept: Optional[str], headers: Optional[dict[str, str]] = None
+) -> Response:
+    """MessagePack or JSON response depending on the Accept header.
+
+    The payload must only hold JSON-native values (dates as ISO strings), so
+    both encodings carry the same data.
+    """
+    headers = {**(headers or {}), "Vary": "Accept"}
+    if not wants_msgpack(accept):
+        return json_response(payload, headers)
+    with phase("encode"):
+        body = msgpack.packb(payload, use_bin_type=True)
+    return Response(content=body, media_type=MSGPACK_MEDIA_TYPES[0], headers=headers)
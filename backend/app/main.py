@@ -1,10 +1,33 @@
 import os
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Query
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import exercises, sessions, templates
+from app import cache, metrics, profiling
+from app.database import pool_metrics
+from app.etag import ConditionalGetMiddleware
+from app.routers import exercises, export, sessions, stats, templates
+from app.versions import start_change_listener
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the cross-worker change listener (cache invalidation)."""
+    start_change_listener()
+    yield
+
 
-app = FastAPI(title="Smart Logger API", version="1.0.0")
+app = FastAPI(
+    title="Smart Logger API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=profiling.ProfiledJSONResponse,
+)
+
+# Conditional GETs (ETag / 304), inside CORS so 304s still carry CORS headers
+app.add_middleware(ConditionalGetMiddleware)
 
 # CORS configuration
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost:3000").split(",")
@@ -15,15 +38,50 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Latency covers every other middleware
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Sampled profiling (opt-in), outermost so its EXPLAINs stay out of the metrics
+if profiling.ENABLED:
+    app.add_middleware(profiling.ProfilingMiddleware)
+
 # Include routers
 app.include_router(exercises.router, prefix="/api")
 app.include_router(sessions.router, prefix="/api")
 app.include_router(templates.router, prefix="/api")
+app.include_router(export.router, prefix="/api")
+app.include_router(stats.router, prefix="/api")
 
 
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "ok"}
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Response cache backend and per-function hit/miss counters."""
+    return {"backend": type(cache.backend).__name__, "functions": cache.stats}
+
+
+@app.get("/api/pool/stats")
+async def pool_stats():
+    """Connection pool gauges, event counters and checkout wait times per engine."""
+    return {name: engine_metrics.snapshot() for name, engine_metrics in pool_metrics.items()}
+
+
+if profiling.ENABLED and "endpoint" in profiling.PROFILE_OUTPUT:
+    @app.get("/api/debug/profiles")
+    async def debug_profiles(limit: int = Query(20, ge=1, le=profiling.PROFILE_KEEP)):
+        """Most recent request profiles, newest first."""
+        return list(profiling.recent_profiles)[-limit:][::-1]
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Request, SQL, pool and cache metrics in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
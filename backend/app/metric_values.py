@@ -0,0 +1,79 @@
+"""Parsing of raw metric strings into typed values for aggregation.
+
+Set metrics are stored as the strings the user typed ("135", "BW", "1:30").
+The parsed numeric and duration columns let SQL aggregate over real numbers.
+"""
+from typing import Optional
+
+# Unit strings that denote a duration, mapped to seconds per unit
+DURATION_UNITS = {
+    "s": 1,
+    "sec": 1,
+    "secs": 1,
+    "second": 1,
+    "seconds": 1,
+    "min": 60,
+    "mins": 60,
+    "minute": 60,
+    "minutes": 60,
+    "h": 3600,
+    "hr": 3600,
+    "hrs": 3600,
+    "hour": 3600,
+    "hours": 3600,
+}
+
+
+def parse_metric_number(value: Optional[str]) -> Optional[float]:
+    """Parse a metric string to a number.
+
+    Clock values ("1:30", "1:02:03") are converted to seconds. Returns None
+    for empty or non-numeric values such as "BW".
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    if ":" in value:
+        seconds = 0.0
+        for part in value.split(":"):
+            try:
+                seconds = seconds * 60 + float(part)
+            except ValueError:
+                return None
+        return seconds
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def parse_duration_seconds(value: Optional[str], unit: Optional[str]) -> Optional[float]:
+    """Parse a metric string to seconds if it is a duration, else None.
+
+    A value is a duration if it is a clock value or its unit is a time unit.
+    """
+    if value is None:
+        return None
+    if ":" in value:
+        return parse_metric_number(value)
+    factor = DURATION_UNITS.get((unit or "").strip().lower())
+    number = parse_metric_number(value)
+    if factor is None or number is None:
+        return None
+    return number * factor
+
+
+def typed_metric_columns(values: dict) -> dict:
+    """Compute the typed metric columns for a set from its raw values.
+
+    `values` holds metricN_value / metricN_unit keys; the first metric that
+    is a duration fills duration_seconds.
+    """
+    columns = {"duration_seconds": None}
+    for n in (1, 2, 3):
+        value = values.get(f"metric{n}_value")
+        unit = values.get(f"metric{n}_unit")
+        columns[f"metric{n}_num"] = parse_metric_number(value)
+        if columns["duration_seconds"] is None:
+            columns["duration_seconds"] = parse_duration_seconds(value, unit)
+    return columns
@@ -0,0 +1,271 @@
+"""Prometheus metrics for HTTP requests and the database work they cause.
+
+MetricsMiddleware times every request and labels it with its route
+template (e.g. /api/sessions/{session_id}), so histograms stay bounded no
+matter which ids are requested. SQL statements are counted and timed with
+cursor events on every engine and attributed to the request that ran them
+through a context variable, which follows the request into the thread
+pool and into AsyncSession.run_sync.
+
+render() produces the Prometheus text format, including the connection
+pool and response cache counters, for GET /metrics.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import cache
+from app.database import async_engine, engine, pool_metrics
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Route label for requests that matched no route (404s, CORS preflights)
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter per label set."""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """Bucketed observations (plus sum and count) per label set."""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...], buckets: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total) in sorted(self._values.items()):
+                lines.extend(_histogram_lines(self.name, self.labelnames, labels, self.buckets, counts, total))
+        return lines
+
+
+def _histogram_lines(name, labelnames, labels, buckets, counts, total) -> list[str]:
+    """Sample lines for one histogram series from non-cumulative bucket counts."""
+    lines = []
+    cumulative = 0
+    for bound, count in zip([*map(str, buckets), "+Inf"], counts):
+        cumulative += count
+        le = f'le="{bound}"'
+        lines.append(f"{name}_bucket{_labels(labelnames, labels, le)} {cumulative}")
+    lines.append(f"{name}_sum{_labels(labelnames, labels)} {total}")
+    lines.append(f"{name}_count{_labels(labelnames, labels)} {cumulative}")
+    return lines
+
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status.",
+    ("method", "route", "status"),
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time from request start to the last response byte.",
+    ("method", "route"), LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Response body size.",
+    ("method", "route"), SIZE_BUCKETS,
+)
+REQUEST_STATEMENTS = Histogram(
+    "http_request_db_statements", "SQL statements executed per request.",
+    ("method", "route"), STATEMENT_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_duration_seconds", "Total SQL execution time per request.",
+    ("method", "route"), LATENCY_BUCKETS,
+)
+
+
+class QueryStats:
+    """SQL statement count and time accumulated by one request."""
+
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def track_queries(target: Engine) -> None:
+    """Count and time every statement executed on target for the current request."""
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_start = time.perf_counter()
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.seconds += time.perf_counter() - context._metrics_start
+
+
+track_queries(engine)
+if async_engine is not None:
+    track_queries(async_engine.sync_engine)
+
+
+_route_templates: dict = {}
+
+
+def _route_template(scope) -> str:
+    """Path template of the route that handled the request."""
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED_ROUTE
+    template = _route_templates.get(endpoint)
+    if template is None:
+        template = next(
+            (route.path for route in scope["app"].routes if getattr(route, "endpoint", None) is endpoint),
+            UNMATCHED_ROUTE,
+        )
+        _route_templates[endpoint] = template
+    return template
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, response size and SQL work per route.
+
+    Timing ends with the last body chunk, so streamed responses (export)
+    include the queries they run while streaming.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _query_stats.set(stats)
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _query_stats.reset(token)
+            labels = (scope["method"], _route_template(scope))
+            REQUESTS.inc((*labels, status))
+            REQUEST_LATENCY.observe(labels, time.perf_counter() - start)
+            RESPONSE_SIZE.observe(labels, size)
+            REQUEST_STATEMENTS.observe(labels, stats.statements)
+            REQUEST_DB_TIME.observe(labels, stats.seconds)
+
+
+_POOL_GAUGES = {
+    "pool_size": "Configured pool size.",
+    "checked_out": "Connections currently checked out.",
+    "overflow": "Connections currently open beyond pool_size.",
+}
+_POOL_COUNTERS = {
+    "checkouts": "Connection checkouts.",
+    "connects": "New database connections opened.",
+    "overflow_connects": "Connections opened beyond pool_size.",
+    "invalidations": "Connections invalidated (e.g. failed pings, disconnects).",
+    "timeouts": "Checkouts that timed out waiting for a connection.",
+}
+
+
+def _pool_lines() -> list[str]:
+    snapshots = {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+    lines = []
+    for key, help_text in _POOL_GAUGES.items():
+        name = f"db_pool_{key}"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        lines += [f'{name}{{engine="{e}"}} {s[key]}' for e, s in snapshots.items()]
+    for key, help_text in _POOL_COUNTERS.items():
+        name = f"db_pool_{key}_total"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        lines += [f'{name}{{engine="{e}"}} {s[key]}' for e, s in snapshots.items()]
+    name = "db_pool_checkout_wait_seconds"
+    lines += [f"# HELP {name} Time spent acquiring a pooled connection.", f"# TYPE {name} histogram"]
+    for e, s in snapshots.items():
+        bounds = tuple(s["wait_buckets"])[:-1]
+        counts = list(s["wait_buckets"].values())
+        lines += _histogram_lines(name, ("engine",), (e,), bounds, counts, s["wait_seconds_total"])
+    return lines
+
+
+def _cache_lines() -> list[str]:
+    name = "cache_requests_total"
+    lines = [f"# HELP {name} Response cache lookups by function and outcome.", f"# TYPE {name} counter"]
+    for function, counters in sorted(cache.stats.items()):
+        for outcome, value in counters.items():
+            lines.append(f"{name}{_labels(('function', 'outcome'), (function, outcome))} {value}")
+    return lines
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in (REQUESTS, REQUEST_LATENCY, RESPONSE_SIZE, REQUEST_STATEMENTS, REQUEST_DB_TIME):
+        lines += metric.render()
+    lines += _pool_lines()
+    lines += _cache_lines()
+    return "\n".join(lines) + "\n"
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Date, JSON, Index, Float, UniqueConstraint
+from sqlalchemy import DDL, event, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -19,14 +20,32 @@ class Exercise(Base):
     metric3_name = Column(String(50), nullable=True)
     metric3_units = Column(JSON, nullable=True)
     field_config = Column(JSON, default=dict)
+    # Date of the newest session logging this exercise (see app.exercise_search)
+    last_used_on = Column(Date, nullable=True)
 
     # Relationships
     template_exercises = relationship("TemplateExercise", back_populates="exercise")
 
 
+def _pg_trgm_available(ddl, target, bind, **kw) -> bool:
+    return bind.scalar(text("SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')"))
+
+
+# Backs name search (as migration 0011); without pg_trgm, search uses an in-process index
+for _ddl in (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX idx_exercise_name_trgm ON api_exercise USING gin (lower(name) gin_trgm_ops)",
+):
+    event.listen(Exercise.__table__, "after_create", DDL(_ddl).execute_if(callable_=_pg_trgm_available))
+
+
 class WorkoutSession(Base):
     """A workout session (collection of sets)."""
     __tablename__ = "api_workoutsession"
+    __table_args__ = (
+        # Backs (date DESC, id DESC) keyset pagination and date-range filters
+        Index("idx_workoutsession_date_id", "date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), default="Workout")
@@ -34,12 +53,22 @@ class WorkoutSession(Base):
     created_at = Column(DateTime, server_default=func.now())
 
     # Relationship to sets
-    sets = relationship("WorkoutSet", back_populates="session", cascade="all, delete-orphan")
+    sets = relationship(
+        "WorkoutSet", back_populates="session", cascade="all, delete-orphan", order_by="WorkoutSet.id"
+    )
 
 
 class WorkoutSet(Base):
     """A single set within a workout session."""
     __tablename__ = "api_workoutset"
+    __table_args__ = (
+        # Backs per-exercise SUM/MAX aggregation over typed weights
+        Index("idx_workoutset_exercise_metric1", "exercise_id", "metric1_num"),
+        # Backs latest-session-per-exercise lookups
+        Index("idx_workoutset_exercise_session", "exercise_id", "session_id"),
+        # Backs loading a session's sets (FKs are not indexed automatically)
+        Index("idx_workoutset_session", "session_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(Integer, ForeignKey("api_workoutsession.id"), nullable=False)
@@ -52,11 +81,33 @@ class WorkoutSet(Base):
     metric3_value = Column(String(20), nullable=True)
     metric3_unit = Column(String(10), nullable=True)
 
+    # Typed copies of the metric strings (see app.metric_values)
+    metric1_num = Column(Float, nullable=True)
+    metric2_num = Column(Float, nullable=True)
+    metric3_num = Column(Float, nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+
     # Relationships
     session = relationship("WorkoutSession", back_populates="sets")
     exercise = relationship("Exercise")
 
 
+class ExerciseRecord(Base):
+    """Best value per exercise and record type, maintained incrementally."""
+    __tablename__ = "api_exercise_record"
+    __table_args__ = (
+        UniqueConstraint("exercise_id", "record_type", name="uq_exercise_record_type"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    exercise_id = Column(Integer, ForeignKey("api_exercise.id", ondelete="CASCADE"), nullable=False)
+    record_type = Column(String(30), nullable=False)
+    value = Column(Float, nullable=False)
+    set_id = Column(Integer, ForeignKey("api_workoutset.id", ondelete="CASCADE"), nullable=False)
+    session_id = Column(Integer, ForeignKey("api_workoutsession.id", ondelete="CASCADE"), nullable=False)
+    achieved_on = Column(Date, nullable=False)
+
+
 class Template(Base):
     """User-managed workout template."""
     __tablename__ = "api_template"
@@ -82,3 +133,11 @@ class TemplateExercise(Base):
     # Relationships
     template = relationship("Template", back_populates="template_exercises")
     exercise = relationship("Exercise", back_populates="template_exercises")
+
+
+class ResourceVersion(Base):
+    """Change counter per resource, bumped by every write (see app.versions)."""
+    __tablename__ = "api_resource_version"
+
+    resource = Column(String(30), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,138 @@
+"""Connection pool health metrics.
+
+Engines created with an instrumented pool class record how long each
+checkout waited (queueing and pre-ping included) and how many timed out.
+Pool events count checkouts, checkins, new connections, connections opened
+beyond pool_size (overflow) and invalidations. Read everything with
+snapshot().
+"""
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PoolMetrics:
+    """Counters and checkout wait histogram for one engine's pool."""
+
+    def __init__(self, engine: Engine):
+        self._engine = engine
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.overflow_connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        # Non-cumulative counts per bucket, plus one for waits above the last bound
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            self.wait_buckets[bisect_left(WAIT_BUCKETS, seconds)] += 1
+
+    def snapshot(self) -> dict:
+        """Counters plus the pool's current size, checked-out and overflow gauges."""
+        pool = self._engine.pool
+        with self._lock:
+            waits = sum(self.wait_buckets)
+            return {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "overflow_connects": self.overflow_connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "wait_seconds_avg": self.wait_seconds_total / waits if waits else 0.0,
+                "wait_buckets": dict(zip([*map(str, WAIT_BUCKETS), "+Inf"], self.wait_buckets)),
+            }
+
+
+class _TimedCheckout:
+    """Pool mixin timing connect() into self.metrics."""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.metrics.count("timeouts")
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool that records checkout wait times."""
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait times."""
+
+
+def instrument(engine: Engine, idle_ping_seconds: float = None) -> PoolMetrics:
+    """Attach metrics and pool event listeners to an instrumented engine.
+
+    With idle_ping_seconds, connections idle in the pool for longer than
+    that are pinged on checkout (and replaced if the ping fails), instead
+    of pinging on every checkout.
+    """
+    metrics = PoolMetrics(engine)
+    engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        metrics.count("connects")
+        if engine.pool.overflow() > 0:
+            metrics.count("overflow_connects")
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.count("checkouts")
+        if idle_ping_seconds is None:
+            return
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is not None and time.monotonic() - checked_in_at > idle_ping_seconds:
+            try:
+                engine.dialect.do_ping(dbapi_connection)
+            except Exception as err:
+                # The pool discards this connection and retries with a fresh one
+                raise exc.DisconnectionError() from err
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        metrics.count("checkins")
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidate(dbapi_connection, connection_record, exception):
+        metrics.count("invalidations")
+
+    return metrics
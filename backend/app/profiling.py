@@ -0,0 +1,304 @@
+"""Opt-in sampled request profiling.
+
+With PROFILE_SAMPLE_RATE > 0, that fraction of requests is profiled.
+Each sampled request records a per-phase breakdown:
+- db: SQL execution time (cursor events)
+- orm_load: turning rows into ORM objects, excluding the SQL itself
+- serialize: response_model validation, or the cache's validate/dump step
+- encode: rendering the JSON response body
+- other: everything else (routing, dependencies, Python in the handler)
+
+It also records every SQL statement with its time. Requests slower than
+PROFILE_THRESHOLD_MS also get EXPLAIN plans for their SELECTs. Profiles go
+to a rotating JSON-lines file (PROFILE_OUTPUT=file), to the in-memory list
+served at GET /api/debug/profiles (PROFILE_OUTPUT=endpoint), or to both.
+
+Unsampled requests only pay for a context variable lookup in each hook.
+"""
+import asyncio
+import functools
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+
+from app.database import DATABASE_ASYNC, SessionLocal, async_engine, engine
+
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_THRESHOLD_MS = float(os.getenv("PROFILE_THRESHOLD_MS", "200"))
+PROFILE_OUTPUT = {o.strip() for o in os.getenv("PROFILE_OUTPUT", "file").lower().split(",")}
+PROFILE_FILE = os.getenv("PROFILE_FILE", "profiles.jsonl")
+PROFILE_FILE_MAX_BYTES = int(os.getenv("PROFILE_FILE_MAX_BYTES", str(10 * 1024 * 1024)))
+PROFILE_FILE_BACKUPS = int(os.getenv("PROFILE_FILE_BACKUPS", "5"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "100"))
+
+ENABLED = PROFILE_SAMPLE_RATE > 0
+
+# Longest SQL text and parameter repr kept per statement
+MAX_SQL_CHARS = 4000
+MAX_PARAMS_CHARS = 500
+
+logger = logging.getLogger(__name__)
+
+
+class Profile:
+    """Timings collected for one sampled request."""
+
+    def __init__(self):
+        self.db = 0.0
+        self.orm = 0.0
+        self.serialize = 0.0
+        self.encode = 0.0
+        self.statements: list[dict] = []
+        self.endpoint_done: Optional[float] = None
+        self._orm_depth = 0
+
+
+_profile: ContextVar[Optional[Profile]] = ContextVar("profile", default=None)
+
+# Most recent profiles, newest last, for the debug endpoint
+recent_profiles: deque = deque(maxlen=PROFILE_KEEP)
+
+_file_logger = None
+if ENABLED and "file" in PROFILE_OUTPUT:
+    _file_logger = logging.getLogger(f"{__name__}.records")
+    _file_logger.propagate = False
+    _file_logger.setLevel(logging.INFO)
+    _handler = RotatingFileHandler(
+        PROFILE_FILE, maxBytes=PROFILE_FILE_MAX_BYTES, backupCount=PROFILE_FILE_BACKUPS
+    )
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    _file_logger.addHandler(_handler)
+
+
+@contextmanager
+def phase(name: str):
+    """Add the block's duration to a phase of the current profile, if any."""
+    profile = _profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(profile, name, getattr(profile, name) + time.perf_counter() - start)
+
+
+def _track_statements(target: Engine, engine_name: str) -> None:
+    @event.listens_for(target, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._profile_start = time.perf_counter()
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        profile = _profile.get()
+        if profile is None:
+            return
+        elapsed = time.perf_counter() - context._profile_start
+        profile.db += elapsed
+        profile.statements.append({
+            "sql": statement[:MAX_SQL_CHARS],
+            "ms": round(elapsed * 1000, 3),
+            "params": repr(parameters)[:MAX_PARAMS_CHARS],
+            "executemany": executemany,
+            "engine": engine_name,
+            # Kept only to run EXPLAIN; dropped before output
+            "_parameters": None if executemany else parameters,
+        })
+
+
+_track_statements(engine, "sync")
+if async_engine is not None:
+    _track_statements(async_engine.sync_engine, "async")
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _time_orm_load(orm_execute_state):
+    """Time ORM SELECTs including row hydration.
+
+    The result is fully loaded here (freeze) so hydration happens inside the
+    timed block; streamed (yield_per) queries are left alone. Nested loads,
+    such as selectinload's follow-up queries, count toward the outermost one.
+    """
+    profile = _profile.get()
+    if (
+        profile is None
+        or profile._orm_depth
+        or not orm_execute_state.is_select
+        or orm_execute_state.execution_options.get("yield_per")
+        or orm_execute_state.execution_options.get("stream_results")
+    ):
+        return None
+    db_before = profile.db
+    start = time.perf_counter()
+    profile._orm_depth += 1
+    try:
+        frozen = orm_execute_state.invoke_statement().freeze()
+    finally:
+        profile._orm_depth -= 1
+    profile.orm += (time.perf_counter() - start) - (profile.db - db_before)
+    return frozen()
+
+
+def _timed_endpoint(call):
+    """Wrap an endpoint to mark when it returned (serialization starts there)."""
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def async_wrapper(**kwargs):
+            result = await call(**kwargs)
+            profile = _profile.get()
+            if profile is not None:
+                profile.endpoint_done = time.perf_counter()
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(call)
+    def wrapper(**kwargs):
+        result = call(**kwargs)
+        profile = _profile.get()
+        if profile is not None:
+            profile.endpoint_done = time.perf_counter()
+        return result
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute that reports when its endpoint returns to the request profile."""
+
+    def get_route_handler(self):
+        self.dependant.call = _timed_endpoint(self.dependant.call)
+        return super().get_route_handler()
+
+
+class ProfiledJSONResponse(JSONResponse):
+    """JSONResponse that times the serialization and encode phases."""
+
+    def render(self, content) -> bytes:
+        profile = _profile.get()
+        if profile is None:
+            return super().render(content)
+        start = time.perf_counter()
+        if profile.endpoint_done is not None:
+            # Between the endpoint returning and rendering: response_model validation
+            profile.serialize += start - profile.endpoint_done
+            profile.endpoint_done = None
+        body = super().render(content)
+        profile.encode += time.perf_counter() - start
+        return body
+
+
+def _is_explainable(statement: dict) -> bool:
+    sql = statement["sql"].lstrip().upper()
+    return not statement["executemany"] and (sql.startswith("SELECT") or sql.startswith("WITH"))
+
+
+def _explain_sync(statements: list[dict]) -> None:
+    with engine.connect() as conn:
+        for statement in statements:
+            rows = conn.exec_driver_sql("EXPLAIN " + statement["sql"], statement["_parameters"] or ())
+            statement["plan"] = [row[0] for row in rows]
+
+
+async def _explain_async(statements: list[dict]) -> None:
+    async with async_engine.connect() as conn:
+        for statement in statements:
+            rows = await conn.exec_driver_sql("EXPLAIN " + statement["sql"], statement["_parameters"] or ())
+            statement["plan"] = [row[0] for row in rows]
+
+
+async def _add_plans(profile: Profile) -> None:
+    """Attach EXPLAIN output to each SELECT, using the engine that ran it."""
+    explainable = [s for s in profile.statements if _is_explainable(s)]
+    try:
+        sync_statements = [s for s in explainable if s["engine"] == "sync"]
+        if sync_statements:
+            await run_in_threadpool(_explain_sync, sync_statements)
+        async_statements = [s for s in explainable if s["engine"] == "async"]
+        if async_statements and DATABASE_ASYNC:
+            await _explain_async(async_statements)
+    except Exception:
+        logger.exception("EXPLAIN failed for profiled request")
+
+
+def _record(entry: dict) -> None:
+    if "endpoint" in PROFILE_OUTPUT:
+        recent_profiles.append(entry)
+    if _file_logger is not None:
+        _file_logger.info(json.dumps(entry, default=str))
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling a random sample of requests.
+
+    Plans and output are produced after the response has been sent.
+    """
+
+    def __init__(self, app, sample_rate: float = PROFILE_SAMPLE_RATE, threshold_ms: float = PROFILE_THRESHOLD_MS):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.threshold_ms = threshold_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile()
+        token = _profile.set(profile)
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            total_ms = (time.perf_counter() - start) * 1000
+            _profile.reset(token)
+
+        slow = total_ms >= self.threshold_ms
+        if slow:
+            await _add_plans(profile)
+        phases = {
+            "db": profile.db,
+            "orm_load": profile.orm,
+            "serialize": profile.serialize,
+            "encode": profile.encode,
+        }
+        phases_ms = {name: round(seconds * 1000, 3) for name, seconds in phases.items()}
+        phases_ms["other"] = round(max(total_ms - sum(phases_ms.values()), 0.0), 3)
+        for statement in profile.statements:
+            del statement["_parameters"]
+        _record({
+            "started_at": started_at.isoformat(),
+            "method": scope["method"],
+            "path": scope["path"],
+            "query": scope["query_string"].decode("latin-1"),
+            "status": status,
+            "total_ms": round(total_ms, 3),
+            "slow": slow,
+            "phases_ms": phases_ms,
+            "statement_count": len(profile.statements),
+            "statements": profile.statements,
+        })
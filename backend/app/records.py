@@ -0,0 +1,100 @@
+"""Personal records (PRs) per exercise, kept in api_exercise_record.
+
+Each record type is a SQL expression over the typed metric columns and
+applies to some category types. Records are upserted from newly written
+sets, and recomputed from history only for exercises whose record-holding
+session was deleted.
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import case, delete, literal, select, union_all
+from sqlalchemy.dialects.postgresql import distinct_on, insert
+from sqlalchemy.orm import Session
+
+from app.models import Exercise, ExerciseRecord, WorkoutSession, WorkoutSet
+
+_weight = WorkoutSet.metric1_num
+_reps = WorkoutSet.metric2_num
+
+# Epley estimate; a single rep is the weight itself, no reps gives NULL
+ESTIMATED_1RM = case(
+    (_reps == 1, _weight),
+    (_reps > 1, _weight * (1 + _reps / 30.0)),
+)
+
+# record_type -> (category types it applies to, value expression)
+RECORD_TYPES = {
+    "max_weight": (("strength",), _weight),
+    "max_reps": (("strength", "flexibility"), _reps),
+    "max_e1rm": (("strength",), ESTIMATED_1RM),
+    "max_set_volume": (("strength",), _weight * _reps),
+    "max_distance": (("cardio",), _reps),
+    "longest_duration": (("cardio", "flexibility", "recovery"), WorkoutSet.duration_seconds),
+}
+
+
+def _candidates(session_ids: Optional[Iterable[int]] = None, exercise_ids: Optional[Iterable[int]] = None):
+    """Best set per exercise for every record type, as one UNION ALL select.
+
+    Ties go to the earliest set. Candidates are limited to the given
+    sessions or exercises when provided.
+    """
+    selects = []
+    for record_type, (category_types, value) in RECORD_TYPES.items():
+        stmt = (
+            select(
+                WorkoutSet.exercise_id,
+                literal(record_type).label("record_type"),
+                value.label("value"),
+                WorkoutSet.id.label("set_id"),
+                WorkoutSession.id.label("session_id"),
+                WorkoutSession.date.label("achieved_on"),
+            )
+            .join(WorkoutSession, WorkoutSession.id == WorkoutSet.session_id)
+            .join(Exercise, Exercise.id == WorkoutSet.exercise_id)
+            .filter(Exercise.category_type.in_(category_types), value.isnot(None))
+            .ext(distinct_on(WorkoutSet.exercise_id))
+            .order_by(WorkoutSet.exercise_id, value.desc(), WorkoutSession.date, WorkoutSet.id)
+        )
+        if session_ids is not None:
+            stmt = stmt.filter(WorkoutSet.session_id.in_(session_ids))
+        if exercise_ids is not None:
+            stmt = stmt.filter(WorkoutSet.exercise_id.in_(exercise_ids))
+        selects.append(stmt)
+    return union_all(*selects).subquery()
+
+
+def _upsert_records(db: Session, candidates) -> None:
+    """Insert candidate records, replacing existing ones only if beaten."""
+    columns = ["exercise_id", "record_type", "value", "set_id", "session_id", "achieved_on"]
+    stmt = insert(ExerciseRecord).from_select(columns, select(*(candidates.c[c] for c in columns)))
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_exercise_record_type",
+        set_={c: stmt.excluded[c] for c in columns[2:]},
+        where=stmt.excluded.value > ExerciseRecord.value,
+    )
+    db.execute(stmt)
+
+
+def update_records_for_sessions(db: Session, session_ids: list[int]) -> None:
+    """Fold newly inserted sessions' sets into the record table."""
+    if session_ids:
+        _upsert_records(db, _candidates(session_ids=session_ids))
+
+
+def rebuild_records(db: Session, exercise_ids: Optional[list[int]] = None) -> None:
+    """Recompute records from full history, for all or the given exercises."""
+    stmt = delete(ExerciseRecord)
+    if exercise_ids is not None:
+        if not exercise_ids:
+            return
+        stmt = stmt.where(ExerciseRecord.exercise_id.in_(exercise_ids))
+    db.execute(stmt)
+    _upsert_records(db, _candidates(exercise_ids=exercise_ids))
+
+
+def exercises_with_records_in_session(db: Session, session_id: int) -> list[int]:
+    """Exercise ids whose records are held by sets in the given session."""
+    return db.scalars(
+        select(ExerciseRecord.exercise_id).where(ExerciseRecord.session_id == session_id).distinct()
+    ).all()
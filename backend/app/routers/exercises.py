@@ -1,23 +1,68 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import desc
+from sqlalchemy import Date, and_, cast, desc, exists, func, or_, select, true
+
+from app.cache import cached
+from app.catalog import catalog
+from app.database import db_endpoint, get_db
+from app.exercise_search import search_exercise_ids
+from app.models import Exercise, ExerciseRecord, WorkoutSession, WorkoutSet
+from app.profiling import ProfiledRoute
+from app.records import ESTIMATED_1RM, rebuild_records
+from app.schemas import (
+    ChartedExerciseRead,
+    ExerciseCreate,
+    ExerciseRead,
+    ExerciseRecordRead,
+    ExerciseSeriesRead,
+    ExerciseUpdate,
+    LatestSetsRequest,
+    ProgressBucketRead,
+    WorkoutSetRead,
+)
+from app.versions import EXERCISES, SESSIONS, TEMPLATES, bump_versions
 
-from app.database import get_db
-from app.models import Exercise, WorkoutSession, WorkoutSet
-from app.schemas import ExerciseCreate, ExerciseRead, ExerciseUpdate, WorkoutSetRead
+router = APIRouter(tags=["exercises"], route_class=ProfiledRoute)
 
-router = APIRouter(tags=["exercises"])
+# Aggregates available to the series endpoint
+SERIES_AGGREGATES = {"max": func.max, "sum": func.sum, "avg": func.avg}
 
 
 @router.get("/exercises", response_model=list[ExerciseRead])
+@db_endpoint
 def list_exercises(db: Session = Depends(get_db)):
-    """List all exercises, ordered by name."""
-    exercises = db.query(Exercise).order_by(Exercise.name).all()
-    return exercises
+    """List all exercises, ordered by name (served from the in-memory catalog)."""
+    return Response(content=catalog.snapshot(db).list_json, media_type="application/json")
+
+
+@router.get("/exercises/search", response_model=list[ExerciseRead])
+@db_endpoint
+def search_exercises(
+    q: str = "",
+    category: Optional[list[str]] = Query(None),
+    category_type: Optional[list[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Search exercises by name, best matches first.
+
+    Matches exact names, then name and word prefixes, substrings and
+    misspellings (trigram similarity), breaking ties by recent use.
+    `category` and `category_type` may be repeated to allow several values.
+    Matching runs on pg_trgm when installed (see app.exercise_search); rows
+    are served from the in-memory catalog.
+    """
+    snapshot = catalog.snapshot(db)
+    exercise_ids = search_exercise_ids(db, snapshot, q, category, category_type, limit)
+    body = b"[" + b",".join(snapshot.item_json[i] for i in exercise_ids) + b"]"
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/exercises", response_model=ExerciseRead, status_code=status.HTTP_201_CREATED)
+@db_endpoint
 def create_exercise(exercise: ExerciseCreate, db: Session = Depends(get_db)):
     """Create a new exercise.
 
@@ -33,6 +78,7 @@ def create_exercise(exercise: ExerciseCreate, db: Session = Depends(get_db)):
     )
     db.add(db_exercise)
     try:
+        bump_versions(db, EXERCISES)
         db.commit()
         db.refresh(db_exercise)
     except IntegrityError:
@@ -44,74 +90,265 @@ def create_exercise(exercise: ExerciseCreate, db: Session = Depends(get_db)):
     return db_exercise
 
 
+def _latest_session_query(exercise_id):
+    """Select the most recent session containing an exercise (LIMIT 1).
+
+    exercise_id is a value or a column of an enclosing query. The ordering
+    on (date DESC, id DESC) is served by the (date, id) and (exercise_id,
+    session_id) indexes, so cost does not grow with history length.
+    """
+    return (
+        select(WorkoutSession.id)
+        .join(WorkoutSet, WorkoutSet.session_id == WorkoutSession.id)
+        .where(WorkoutSet.exercise_id == exercise_id)
+        .order_by(desc(WorkoutSession.date), desc(WorkoutSession.id))
+        .limit(1)
+    )
+
+
+# Columns of a latest-sets row, after the exercise name
+_LATEST_SET_COLUMNS = (
+    WorkoutSet.set_number,
+    WorkoutSet.metric1_value,
+    WorkoutSet.metric1_unit,
+    WorkoutSet.metric2_value,
+    WorkoutSet.metric2_unit,
+    WorkoutSet.metric3_value,
+    WorkoutSet.metric3_unit,
+)
+
+
+def _latest_sets_query(exercise_id: int):
+    """Single statement selecting the latest session's sets for an exercise.
+
+    The most recent session is picked once in an uncorrelated subquery
+    (see _latest_session_query).
+    """
+    latest_session_id = _latest_session_query(exercise_id).scalar_subquery()
+    return (
+        select(WorkoutSet.id, Exercise.name.label("exercise"), *_LATEST_SET_COLUMNS)
+        .join(Exercise, Exercise.id == WorkoutSet.exercise_id)
+        .where(WorkoutSet.exercise_id == exercise_id, WorkoutSet.session_id == latest_session_id)
+        .order_by(WorkoutSet.set_number)
+    )
+
+
+def _latest_sets_batch_query(names: list[str], exercise_ids: list[int]):
+    """Single statement selecting the latest session's sets for many exercises.
+
+    Each requested exercise finds its latest session with the same LIMIT 1
+    index probe as _latest_sets_query, through a LATERAL join, so cost grows
+    with the number of exercises asked for rather than with history length.
+    """
+    wanted = (
+        select(Exercise.id, Exercise.name)
+        .where(or_(Exercise.name.in_(names), Exercise.id.in_(exercise_ids)))
+        .subquery("wanted")
+    )
+    latest = _latest_session_query(wanted.c.id).correlate(wanted).lateral("latest")
+    return (
+        select(
+            wanted.c.id.label("exercise_id"),
+            WorkoutSet.id,
+            wanted.c.name.label("exercise"),
+            *_LATEST_SET_COLUMNS,
+        )
+        .select_from(wanted)
+        .join(latest, true())
+        .join(
+            WorkoutSet,
+            and_(WorkoutSet.exercise_id == wanted.c.id, WorkoutSet.session_id == latest.c.id),
+        )
+        .order_by(wanted.c.id, WorkoutSet.set_number)
+    )
+
+
 @router.get("/exercises/latest-sets-by-name", response_model=list[WorkoutSetRead])
+@db_endpoint
+@cached(list[WorkoutSetRead], tags=(SESSIONS, EXERCISES))
 def latest_sets_by_name(name: str, db: Session = Depends(get_db)):
     """Get most recent sets for a given exercise name.
 
     Returns sets from the most recent session containing this exercise,
     ordered by set number. Returns empty list if exercise has never been logged.
     """
-    # Step 1: Find most recent session with this exercise
-    most_recent_session = (
-        db.query(WorkoutSession)
-        .join(WorkoutSet)
-        .join(Exercise)
-        .filter(Exercise.name == name)
-        .order_by(desc(WorkoutSession.date))
-        .first()
-    )
-
-    if not most_recent_session:
+    exercise_id = catalog.snapshot(db).id_by_name.get(name)
+    if exercise_id is None:
         return []
+    return [row._asdict() for row in db.execute(_latest_sets_query(exercise_id)).all()]
 
-    # Step 2: Get all sets from that session for this exercise, ordered by set_number
-    sets = (
-        db.query(WorkoutSet)
-        .join(Exercise)
-        .filter(
-            WorkoutSet.session_id == most_recent_session.id,
-            Exercise.name == name,
-        )
-        .order_by(WorkoutSet.set_number)
+
+@router.post("/exercises/latest-sets", response_model=dict[str, list[WorkoutSetRead]])
+@db_endpoint
+def latest_sets_batch(request: LatestSetsRequest, db: Session = Depends(get_db)):
+    """Get most recent sets for many exercises in one query.
+
+    Returns a map keyed by each requested name (and by each requested id,
+    as a string) to the sets of that exercise's most recent session,
+    ordered by set number. Exercises never logged map to an empty list.
+    """
+    rows = db.execute(_latest_sets_batch_query(request.names, request.exercise_ids)).all()
+
+    by_name = {name: [] for name in request.names}
+    by_id = {exercise_id: [] for exercise_id in request.exercise_ids}
+    for row in rows:
+        workout_set = row._asdict()
+        exercise_id = workout_set.pop("exercise_id")
+        if row.exercise in by_name:
+            by_name[row.exercise].append(workout_set)
+        if exercise_id in by_id:
+            by_id[exercise_id].append(workout_set)
+
+    result = {str(exercise_id): sets for exercise_id, sets in by_id.items()}
+    result.update(by_name)
+    return result
+
+
+@router.get("/exercises/records", response_model=list[ExerciseRecordRead])
+@db_endpoint
+def list_records(db: Session = Depends(get_db)):
+    """List personal records for all exercises, ordered by exercise and type."""
+    return (
+        db.query(ExerciseRecord)
+        .order_by(ExerciseRecord.exercise_id, ExerciseRecord.record_type)
         .all()
     )
 
-    # Convert to response format (manually construct dicts to map exercise relationship to name string)
-    result = []
-    for workout_set in sets:
-        result.append(
-            {
-                "id": workout_set.id,
-                "exercise": workout_set.exercise.name,
-                "set_number": workout_set.set_number,
-                "metric1_value": workout_set.metric1_value,
-                "metric1_unit": workout_set.metric1_unit,
-                "metric2_value": workout_set.metric2_value,
-                "metric2_unit": workout_set.metric2_unit,
-                "metric3_value": workout_set.metric3_value,
-                "metric3_unit": workout_set.metric3_unit,
-            }
-        )
 
-    return result
+@router.get("/exercises/charted", response_model=list[ChartedExerciseRead])
+@db_endpoint
+def list_charted_exercises(db: Session = Depends(get_db)):
+    """List exercises with at least one numeric metric1 value, ordered by name.
+
+    Each exercise is checked with an EXISTS probe on the (exercise_id,
+    metric1_num) index rather than a scan of its history.
+    """
+    has_numeric_data = exists().where(
+        WorkoutSet.exercise_id == Exercise.id,
+        WorkoutSet.metric1_num.isnot(None),
+    )
+    return (
+        db.query(Exercise.id, Exercise.name)
+        .filter(has_numeric_data)
+        .order_by(Exercise.name)
+        .all()
+    )
 
 
 @router.get("/exercises/{exercise_id}", response_model=ExerciseRead)
+@db_endpoint
 def get_exercise(exercise_id: int, db: Session = Depends(get_db)):
     """Get exercise by ID.
 
     Returns 404 if not found.
     """
-    exercise = db.query(Exercise).filter(Exercise.id == exercise_id).first()
-    if not exercise:
+    item_json = catalog.snapshot(db).item_json.get(exercise_id)
+    if item_json is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Exercise with id {exercise_id} not found",
         )
-    return exercise
+    return Response(content=item_json, media_type="application/json")
+
+
+@router.get("/exercises/{exercise_id}/progress", response_model=list[ProgressBucketRead])
+@db_endpoint
+@cached(list[ProgressBucketRead], tags=(SESSIONS, EXERCISES))
+def exercise_progress(
+    exercise_id: int,
+    bucket: Literal["week", "month"] = "week",
+    db: Session = Depends(get_db),
+):
+    """Per-week or per-month progress for an exercise, oldest first.
+
+    Aggregated in SQL over the typed metric columns, treating metric1 as
+    weight and metric2 as reps: top set (max weight), total volume
+    (weight x reps), set count and estimated 1RM (Epley).
+    Returns 404 if exercise not found.
+    """
+    if not db.query(Exercise.id).filter(Exercise.id == exercise_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Exercise with id {exercise_id} not found",
+        )
+
+    weight = WorkoutSet.metric1_num
+    reps = WorkoutSet.metric2_num
+    period_start = cast(func.date_trunc(bucket, WorkoutSession.date), Date).label("period_start")
+    rows = (
+        db.query(
+            period_start,
+            func.count(WorkoutSet.id).label("set_count"),
+            func.max(weight).label("top_set"),
+            func.sum(weight * reps).label("total_volume"),
+            func.max(ESTIMATED_1RM).label("estimated_1rm"),
+        )
+        .join(WorkoutSession, WorkoutSession.id == WorkoutSet.session_id)
+        .filter(WorkoutSet.exercise_id == exercise_id)
+        .group_by(period_start)
+        .order_by(period_start)
+        .all()
+    )
+    return [row._asdict() for row in rows]
+
+
+@router.get("/exercises/{exercise_id}/series", response_model=ExerciseSeriesRead)
+@db_endpoint
+@cached(ExerciseSeriesRead, tags=(SESSIONS, EXERCISES))
+def exercise_series(
+    exercise_id: int,
+    metric: Literal["metric1", "metric2", "metric3"] = "metric1",
+    agg: Literal["max", "sum", "avg"] = "max",
+    db: Session = Depends(get_db),
+):
+    """Per-date aggregate of one numeric metric for an exercise, oldest first.
+
+    Non-numeric values (e.g. "BW") are ignored. The unit is taken from the
+    most recent date. Returns 404 if exercise not found.
+    """
+    if not db.query(Exercise.id).filter(Exercise.id == exercise_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Exercise with id {exercise_id} not found",
+        )
+
+    value = getattr(WorkoutSet, f"{metric}_num")
+    unit = getattr(WorkoutSet, f"{metric}_unit")
+    rows = (
+        db.query(
+            WorkoutSession.date,
+            SERIES_AGGREGATES[agg](value).label("value"),
+            func.max(unit).label("unit"),
+        )
+        .join(WorkoutSession, WorkoutSession.id == WorkoutSet.session_id)
+        .filter(WorkoutSet.exercise_id == exercise_id, value.isnot(None))
+        .group_by(WorkoutSession.date)
+        .order_by(WorkoutSession.date)
+        .all()
+    )
+    return {
+        "exercise_id": exercise_id,
+        "metric": metric,
+        "agg": agg,
+        "unit": rows[-1].unit if rows else None,
+        "points": [{"date": row.date, "value": row.value} for row in rows],
+    }
+
+
+@router.get("/exercises/{exercise_id}/records", response_model=list[ExerciseRecordRead])
+@db_endpoint
+def exercise_records(exercise_id: int, db: Session = Depends(get_db)):
+    """List personal records for one exercise (empty if none logged)."""
+    return (
+        db.query(ExerciseRecord)
+        .filter(ExerciseRecord.exercise_id == exercise_id)
+        .order_by(ExerciseRecord.record_type)
+        .all()
+    )
 
 
 @router.patch("/exercises/{exercise_id}", response_model=ExerciseRead)
+@db_endpoint
 def patch_exercise(
     exercise_id: int,
     exercise_update: ExerciseUpdate,
@@ -135,6 +372,11 @@ def patch_exercise(
         setattr(db_exercise, field, value)
 
     try:
+        # Record types depend on the category type
+        if "category_type" in update_data:
+            db.flush()
+            rebuild_records(db, [exercise_id])
+        bump_versions(db, EXERCISES)
         db.commit()
         db.refresh(db_exercise)
     except IntegrityError:
@@ -147,6 +389,7 @@ def patch_exercise(
 
 
 @router.delete("/exercises/{exercise_id}", status_code=status.HTTP_204_NO_CONTENT)
+@db_endpoint
 def delete_exercise(exercise_id: int, db: Session = Depends(get_db)):
     """Delete exercise by ID.
 
@@ -160,5 +403,6 @@ def delete_exercise(exercise_id: int, db: Session = Depends(get_db)):
             detail=f"Exercise with id {exercise_id} not found",
         )
     db.delete(db_exercise)
+    bump_versions(db, EXERCISES, TEMPLATES)
     db.commit()
     return None
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+from typing import Iterator, Literal
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models import Exercise, WorkoutSession, WorkoutSet
+from app.profiling import ProfiledRoute
+
+router = APIRouter(tags=["export"], route_class=ProfiledRoute)
+
+# Rows are pulled from a server-side cursor this many at a time
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    WorkoutSession.id.label("session_id"),
+    WorkoutSession.name.label("session_name"),
+    WorkoutSession.date.label("session_date"),
+    WorkoutSet.id.label("set_id"),
+    Exercise.name.label("exercise"),
+    Exercise.category.label("category"),
+    Exercise.category_type.label("category_type"),
+    WorkoutSet.set_number,
+    WorkoutSet.metric1_value,
+    WorkoutSet.metric1_unit,
+    WorkoutSet.metric2_value,
+    WorkoutSet.metric2_unit,
+    WorkoutSet.metric3_value,
+    WorkoutSet.metric3_unit,
+)
+
+
+def _iter_export_batches(db: Session) -> Iterator[list]:
+    """Yield batches of flattened set rows (one per WorkoutSet) in date order.
+
+    Uses a server-side cursor so memory stays flat regardless of history size.
+    """
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .join(WorkoutSet, WorkoutSet.session_id == WorkoutSession.id)
+        .join(Exercise, Exercise.id == WorkoutSet.exercise_id)
+        .order_by(WorkoutSession.date, WorkoutSession.id, WorkoutSet.set_number)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    yield from db.execute(stmt).partitions()
+
+
+def _ndjson_lines(db: Session) -> Iterator[str]:
+    """Encode export rows as newline-delimited JSON."""
+    for batch in _iter_export_batches(db):
+        yield "".join(json.dumps(row._asdict(), default=str) + "\n" for row in batch)
+
+
+def _csv_lines(db: Session) -> Iterator[str]:
+    """Encode export rows as CSV with a header line."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(column.key for column in EXPORT_COLUMNS)
+    for batch in _iter_export_batches(db):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+@router.get("/export/sessions")
+def export_sessions(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    db: Session = Depends(get_db),
+):
+    """Stream the full workout history, one flattened row per set.
+
+    Each row joins the set with its session and exercise columns.
+    """
+    if format == "csv":
+        content, media_type = _csv_lines(db), "text/csv"
+    else:
+        content, media_type = _ndjson_lines(db), "application/x-ndjson"
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="sessions.{format}"'},
+    )
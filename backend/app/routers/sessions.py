@@ -1,21 +1,233 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+import codecs
+import json
+import re
+from datetime import date
+from typing import AsyncIterator, Literal, Optional
 
-from app.database import get_db
-from app.models import Exercise, WorkoutSession, WorkoutSet
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from pydantic import ValidationError
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import desc, func, insert, select, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import fast_json
+from app.cache import cached
+from app.catalog import catalog
+from app.database import db_endpoint, get_db, get_request_db, run_db
+from app.exercise_search import rebuild_last_used, update_last_used_for_sessions
+from app.metric_values import typed_metric_columns
+from app.models import Exercise, ExerciseRecord, WorkoutSession, WorkoutSet
+from app.profiling import ProfiledRoute
+from app.records import (
+    exercises_with_records_in_session,
+    rebuild_records,
+    update_records_for_sessions,
+)
 from app.schemas import (
+    BulkChunkResult,
+    BulkImportResult,
+    BulkRowError,
+    DaySummaryRead,
     WorkoutSessionCreate,
     WorkoutSessionRead,
     WorkoutSessionUpdate,
+    WorkoutSetCreate,
     WorkoutSetRead,
 )
+from app.versions import EXERCISES, SESSIONS, bump_versions
+
+router = APIRouter(tags=["sessions"], route_class=ProfiledRoute)
+
+
+def _session_query(db: Session):
+    """Base session query that eager-loads sets and their exercise names.
+
+    Sets are fetched with one SELECT ... IN per batch of sessions, with the
+    exercise name joined in, so serializing any number of sessions costs a
+    fixed number of queries instead of one per session and one per set.
+    """
+    return db.query(WorkoutSession).options(
+        selectinload(WorkoutSession.sets)
+        .joinedload(WorkoutSet.exercise)
+        .load_only(Exercise.name)
+    )
+
+
+def _get_session_or_404(db: Session, session_id: int) -> WorkoutSession:
+    """Load a session with its sets eager-loaded, or raise 404."""
+    db_session = _session_query(db).filter(WorkoutSession.id == session_id).first()
+    if not db_session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session with id {session_id} not found",
+        )
+    return db_session
+
 
-router = APIRouter(tags=["sessions"])
+def _resolve_exercise_ids(db: Session, names: set[str]) -> dict[str, int]:
+    """Map exercise names to ids from the in-memory catalog.
+
+    Names missing from the catalog are re-checked with one IN query, in case
+    another worker created them and its invalidation has not arrived yet.
+    Raises 404 listing every name that does not exist.
+    """
+    id_by_name = catalog.snapshot(db).id_by_name
+    exercise_ids = {name: id_by_name[name] for name in names if name in id_by_name}
+    unresolved = names - exercise_ids.keys()
+    if unresolved:
+        rows = db.query(Exercise.name, Exercise.id).filter(Exercise.name.in_(unresolved)).all()
+        if rows:
+            catalog.invalidate()
+        exercise_ids.update((name, exercise_id) for name, exercise_id in rows)
+    missing = sorted(names - exercise_ids.keys())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Exercises not found: {', '.join(repr(name) for name in missing)}",
+        )
+    return exercise_ids
+
+
+def _set_row(session_id: int, exercise_ids: dict[str, int], set_data: WorkoutSetCreate) -> dict:
+    """Build an api_workoutset row (raw and typed metrics) for bulk insertion."""
+    row = {
+        "session_id": session_id,
+        "exercise_id": exercise_ids[set_data.exercise],
+        "set_number": set_data.set_number,
+        "metric1_value": set_data.metric1_value,
+        "metric1_unit": set_data.metric1_unit,
+        "metric2_value": set_data.metric2_value,
+        "metric2_unit": set_data.metric2_unit,
+        "metric3_value": set_data.metric3_value,
+        "metric3_unit": set_data.metric3_unit,
+    }
+    row.update(typed_metric_columns(row))
+    return row
+
+
+def _parse_cursor(cursor: str) -> tuple[date, int]:
+    """Decode a list_sessions cursor of the form 'YYYY-MM-DD:id'.
+
+    Raises 400 if the cursor is malformed.
+    """
+    try:
+        date_part, id_part = cursor.split(":", 1)
+        return date.fromisoformat(date_part), int(id_part)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor '{cursor}'",
+        )
+
+
+# WorkoutSetRead fields, in order, and the columns that fill them
+SET_FIELDS = (
+    "id", "exercise", "set_number",
+    "metric1_value", "metric1_unit",
+    "metric2_value", "metric2_unit",
+    "metric3_value", "metric3_unit",
+)
+SET_COLUMNS = (
+    WorkoutSet.id, Exercise.name, WorkoutSet.set_number,
+    WorkoutSet.metric1_value, WorkoutSet.metric1_unit,
+    WorkoutSet.metric2_value, WorkoutSet.metric2_unit,
+    WorkoutSet.metric3_value, WorkoutSet.metric3_unit,
+)
+
+
+def _session_rows(db: Session, conditions: list, limit: Optional[int] = None):
+    """Session rows (newest first) and their set rows (by id) for matching sessions.
+
+    Two queries whatever the result size and no ORM objects. Set rows are
+    (session_id, *SET_COLUMNS).
+    """
+    stmt = (
+        select(WorkoutSession.name, WorkoutSession.date, WorkoutSession.id, WorkoutSession.created_at)
+        .where(*conditions)
+        .order_by(desc(WorkoutSession.date), desc(WorkoutSession.id))
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    session_rows = db.execute(stmt).all()
+    if not session_rows:
+        return [], []
+
+    # A page's ids are few enough to bind; otherwise repeat the filter
+    if limit is not None:
+        session_ids = [row.id for row in session_rows]
+    else:
+        session_ids = select(WorkoutSession.id).where(*conditions)
+    set_rows = db.execute(
+        select(WorkoutSet.session_id, *SET_COLUMNS)
+        .join(Exercise, WorkoutSet.exercise_id == Exercise.id)
+        .where(WorkoutSet.session_id.in_(session_ids))
+        .order_by(WorkoutSet.id)
+    ).all()
+    return session_rows, set_rows
+
+
+def _session_payloads(session_rows, set_rows) -> list[dict]:
+    """WorkoutSessionRead-shaped dicts from _session_rows output, for fast_json."""
+    sessions = {
+        session_id: {"name": name, "date": day, "id": session_id, "created_at": created_at, "sets": []}
+        for name, day, session_id, created_at in session_rows
+    }
+    for session_id, *values in set_rows:
+        sessions[session_id]["sets"].append(dict(zip(SET_FIELDS, values)))
+    return list(sessions.values())
+
+
+def _columnar_payload(session_rows, set_rows) -> dict:
+    """Parallel column arrays from _session_rows output.
+
+    Exercise names and units are replaced by indexes into the "exercises"
+    and "units" dictionaries (null stays null). Sets point at their session
+    through sets.session_id. Dates are ISO strings, so the payload encodes
+    the same way as JSON and as MessagePack.
+    """
+    exercise_codes: dict[str, int] = {}
+    unit_codes: dict[str, int] = {}
+
+    def unit_code(unit):
+        return None if unit is None else unit_codes.setdefault(unit, len(unit_codes))
+
+    sets = {field: [] for field in ("session_id", *SET_FIELDS)}
+    for (session_id, set_id, exercise, set_number,
+         metric1_value, metric1_unit, metric2_value, metric2_unit,
+         metric3_value, metric3_unit) in set_rows:
+        sets["session_id"].append(session_id)
+        sets["id"].append(set_id)
+        sets["exercise"].append(exercise_codes.setdefault(exercise, len(exercise_codes)))
+        sets["set_number"].append(set_number)
+        sets["metric1_value"].append(metric1_value)
+        sets["metric1_unit"].append(unit_code(metric1_unit))
+        sets["metric2_value"].append(metric2_value)
+        sets["metric2_unit"].append(unit_code(metric2_unit))
+        sets["metric3_value"].append(metric3_value)
+        sets["metric3_unit"].append(unit_code(metric3_unit))
+
+    return {
+        "sessions": {
+            "id": [row.id for row in session_rows],
+            "name": [row.name for row in session_rows],
+            "date": [row.date.isoformat() for row in session_rows],
+            "created_at": [row.created_at and row.created_at.isoformat() for row in session_rows],
+        },
+        "sets": sets,
+        "exercises": list(exercise_codes),
+        "units": list(unit_codes),
+    }
+
+
+def _next_cursor(day: date, session_id: int) -> str:
+    return f"{day.isoformat()}:{session_id}"
 
 
 def _serialize_session(db_session: WorkoutSession) -> dict:
-    """Convert WorkoutSession ORM object to dict with serialized nested sets."""
+    """Convert WorkoutSession ORM object to dict with serialized nested sets.
+
+    Expects sets and exercises to be loaded already (see _session_query).
+    """
     sets = []
     for workout_set in db_session.sets:
         sets.append(
@@ -42,15 +254,68 @@ def _serialize_session(db_session: WorkoutSession) -> dict:
 
 
 @router.get("/sessions", response_model=list[WorkoutSessionRead])
-def list_sessions(db: Session = Depends(get_db)):
-    """List all sessions, ordered by date (most recent first), with nested sets."""
-    sessions = (
-        db.query(WorkoutSession).order_by(desc(WorkoutSession.date)).all()
-    )
+@db_endpoint
+def list_sessions(
+    response: Response,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    format: Literal["json", "columnar"] = "json",
+    accept: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """List sessions, ordered by date (most recent first), with nested sets.
+
+    Optional `from`/`to` bound the date range (inclusive). When `limit` is
+    given, results are keyset-paginated on (date, id): if more sessions
+    remain, the X-Next-Cursor header holds the cursor for the next page.
+    `format=columnar` returns parallel arrays per column with exercise
+    names and units dictionary-encoded (see _columnar_payload), as
+    MessagePack if the Accept header asks for application/msgpack.
+    Returns 400 if the cursor is malformed.
+    """
+    conditions = []
+    if date_from:
+        conditions.append(WorkoutSession.date >= date_from)
+    if date_to:
+        conditions.append(WorkoutSession.date <= date_to)
+    if cursor:
+        cursor_date, cursor_id = _parse_cursor(cursor)
+        conditions.append(
+            tuple_(WorkoutSession.date, WorkoutSession.id) < tuple_(cursor_date, cursor_id)
+        )
+
+    if format == "columnar" or fast_json.enabled("list_sessions"):
+        # Fetch one extra row to know whether another page exists
+        session_rows, set_rows = _session_rows(db, conditions, None if limit is None else limit + 1)
+        headers = {}
+        if limit is not None and len(session_rows) > limit:
+            extra_id = session_rows[limit].id
+            session_rows = session_rows[:limit]
+            set_rows = [row for row in set_rows if row.session_id != extra_id]
+            last = session_rows[-1]
+            headers["X-Next-Cursor"] = _next_cursor(last.date, last.id)
+        if format == "columnar":
+            return fast_json.negotiated_response(_columnar_payload(session_rows, set_rows), accept, headers)
+        return fast_json.json_response(_session_payloads(session_rows, set_rows), headers)
+
+    query = _session_query(db).filter(*conditions)
+    query = query.order_by(desc(WorkoutSession.date), desc(WorkoutSession.id))
+
+    if limit is None:
+        return [_serialize_session(s) for s in query.all()]
+
+    # Fetch one extra row to know whether another page exists
+    sessions = query.limit(limit + 1).all()
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        response.headers["X-Next-Cursor"] = _next_cursor(sessions[-1].date, sessions[-1].id)
     return [_serialize_session(s) for s in sessions]
 
 
 @router.post("/sessions", response_model=WorkoutSessionRead, status_code=status.HTTP_201_CREATED)
+@db_endpoint
 def create_session(
     session: WorkoutSessionCreate,
     db: Session = Depends(get_db),
@@ -60,40 +325,283 @@ def create_session(
     Each set's exercise field must be an existing exercise name.
     Returns 404 if any exercise name is not found.
     """
+    # Resolve every exercise name up front in one query
+    exercise_ids = _resolve_exercise_ids(db, {s.exercise for s in session.sets})
+
     # Create session
     db_session = WorkoutSession(name=session.name, date=session.date)
     db.add(db_session)
     db.flush()  # Flush to get the session ID before creating sets
+    session_id = db_session.id
 
-    # Create sets
-    for set_data in session.sets:
-        # Look up exercise by name
-        exercise = db.query(Exercise).filter(Exercise.name == set_data.exercise).first()
-        if not exercise:
-            db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Exercise '{set_data.exercise}' not found",
+    # Create sets with a single multi-row INSERT
+    if session.sets:
+        db.execute(
+            insert(WorkoutSet),
+            [_set_row(session_id, exercise_ids, s) for s in session.sets],
+        )
+        update_records_for_sessions(db, [session_id])
+        update_last_used_for_sessions(db, [session_id])
+
+    bump_versions(db, SESSIONS)
+    db.commit()
+    return _serialize_session(_get_session_or_404(db, session_id))
+
+
+# Separators skipped between JSON array elements
+_ARRAY_GAP = re.compile(r"[\s,]*")
+# Characters that cannot appear in a cut-off token (literal, number or \\u escape)
+_TOKEN_BREAK = re.compile(r'[\s,:\[\]{}"]')
+
+
+def _is_truncated(buffer: str, error: json.JSONDecodeError) -> bool:
+    """Whether a decode error could be resolved by more input rather than being malformed."""
+    if error.msg.startswith("Unterminated string"):
+        return True
+    tail = buffer[error.pos:]
+    return len(tail) <= len("-Infinity") and not _TOKEN_BREAK.search(tail)
+
+
+def _bad_array_element(row: int, message: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Invalid JSON in array element {row}: {message}",
+    )
+
+
+async def _iter_bulk_rows(request: Request) -> AsyncIterator[tuple[int, object]]:
+    """Stream-parse a request body of NDJSON or a JSON array of objects.
+
+    Yields (row_number, value) pairs without buffering the whole body. A
+    malformed NDJSON line is yielded as a JSONDecodeError so it can be
+    reported as a row error. The elements after a malformed array element
+    cannot be recovered, so it raises a 400 as soon as that element is
+    complete.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    is_array = None
+    closed = False
+    row = 0
+
+    async for chunk in request.stream():
+        buffer += text.decode(chunk)
+        if is_array is None:
+            buffer = buffer.lstrip()
+            if not buffer:
+                continue
+            is_array = buffer.startswith("[")
+            if is_array:
+                buffer = buffer[1:]
+
+        if is_array:
+            if closed:
+                continue
+            # Walk the buffer by offset and drop the decoded prefix once per chunk
+            idx = 0
+            while True:
+                idx = _ARRAY_GAP.match(buffer, idx).end()
+                if idx == len(buffer):
+                    break
+                if buffer[idx] == "]":
+                    closed = True
+                    idx += 1
+                    break
+                try:
+                    value, end = decoder.raw_decode(buffer, idx)
+                except json.JSONDecodeError as e:
+                    if _is_truncated(buffer, e):
+                        break  # Wait for the rest of the element
+                    raise _bad_array_element(row + 1, e.msg)
+                if end == len(buffer):
+                    break  # A number may continue in the next chunk
+                idx = end
+                row += 1
+                yield row, value
+            buffer = buffer[idx:]
+        else:
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                if not line.strip():
+                    continue
+                row += 1
+                try:
+                    yield row, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield row, e
+
+    buffer = (buffer + text.decode(b"", final=True)).strip()
+    if is_array:
+        if closed:
+            return
+        # Only a final element (or a cut-off body) can be left over
+        idx = _ARRAY_GAP.match(buffer).end()
+        if idx < len(buffer) and buffer[idx] != "]":
+            try:
+                value, idx = decoder.raw_decode(buffer, idx)
+            except json.JSONDecodeError as e:
+                raise _bad_array_element(row + 1, e.msg)
+            row += 1
+            yield row, value
+            idx = _ARRAY_GAP.match(buffer, idx).end()
+        if buffer[idx:] != "]":
+            raise _bad_array_element(row + 1, "Unterminated array")
+    elif buffer:
+        row += 1
+        try:
+            yield row, json.loads(buffer)
+        except json.JSONDecodeError as e:
+            yield row, e
+
+
+def _insert_bulk_chunk(
+    db: Session,
+    chunk_number: int,
+    rows: list[tuple[int, object]],
+    exercise_ids: dict[str, int],
+) -> BulkChunkResult:
+    """Validate and insert one chunk of sessions in its own transaction.
+
+    Invalid rows are reported and skipped; a database error rolls back only
+    this chunk.
+    """
+    errors = []
+    sessions = []
+    for row, value in rows:
+        if isinstance(value, ValueError):  # Includes json.JSONDecodeError
+            errors.append(BulkRowError(row=row, detail=f"Invalid JSON: {value}"))
+            continue
+        try:
+            session = WorkoutSessionCreate.model_validate(value)
+        except ValidationError as e:
+            errors.append(BulkRowError(row=row, detail=str(e)))
+            continue
+        missing = sorted({s.exercise for s in session.sets} - exercise_ids.keys())
+        if missing:
+            errors.append(
+                BulkRowError(
+                    row=row,
+                    detail=f"Exercises not found: {', '.join(repr(name) for name in missing)}",
+                )
+            )
+            continue
+        sessions.append(session)
+
+    if not sessions:
+        return BulkChunkResult(chunk=chunk_number, sessions_inserted=0, sets_inserted=0, errors=errors)
+
+    try:
+        session_ids = db.scalars(
+            insert(WorkoutSession).returning(WorkoutSession.id, sort_by_parameter_order=True),
+            [{"name": s.name, "date": s.date} for s in sessions],
+        ).all()
+        set_rows = [
+            _set_row(session_id, exercise_ids, set_data)
+            for session_id, session in zip(session_ids, sessions)
+            for set_data in session.sets
+        ]
+        if set_rows:
+            db.execute(insert(WorkoutSet), set_rows)
+            update_records_for_sessions(db, session_ids)
+            update_last_used_for_sessions(db, session_ids)
+        bump_versions(db, SESSIONS)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        errors.append(BulkRowError(row=rows[0][0], detail=f"Chunk rolled back: {e}"))
+        return BulkChunkResult(chunk=chunk_number, sessions_inserted=0, sets_inserted=0, errors=errors)
+
+    return BulkChunkResult(
+        chunk=chunk_number,
+        sessions_inserted=len(sessions),
+        sets_inserted=len(set_rows),
+        errors=errors,
+    )
+
+
+@router.post("/sessions/bulk", response_model=BulkImportResult)
+async def bulk_create_sessions(
+    request: Request,
+    chunk_size: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_request_db),
+):
+    """Import many sessions from NDJSON or a JSON array of WorkoutSessionCreate.
+
+    The body is parsed as it streams in and inserted in chunks of
+    `chunk_size` sessions, each in its own transaction with multi-row
+    INSERTs. Rows that fail validation or reference unknown exercises are
+    reported per chunk without affecting the rest of the import. A malformed
+    JSON array body stops the import with a 400 at the first bad element;
+    chunks committed before it are kept.
+    """
+    # Resolve every name from one name -> id map taken from the catalog
+    exercise_ids = (await run_db(db, catalog.snapshot)).id_by_name
+
+    chunks = []
+    pending = []
+    async for row in _iter_bulk_rows(request):
+        pending.append(row)
+        if len(pending) >= chunk_size:
+            chunks.append(
+                await run_db(db, _insert_bulk_chunk, len(chunks) + 1, pending, exercise_ids)
             )
+            pending = []
+    if pending:
+        chunks.append(
+            await run_db(db, _insert_bulk_chunk, len(chunks) + 1, pending, exercise_ids)
+        )
+
+    return BulkImportResult(
+        sessions_inserted=sum(c.sessions_inserted for c in chunks),
+        sets_inserted=sum(c.sets_inserted for c in chunks),
+        chunks=chunks,
+    )
+
+
+@router.get("/sessions/summary", response_model=list[DaySummaryRead])
+@db_endpoint
+def sessions_summary(
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+):
+    """Per-day session summaries (ids, names, set counts), most recent first.
 
-        # Create set
-        db_set = WorkoutSet(
-            session_id=db_session.id,
-            exercise_id=exercise.id,
-            set_number=set_data.set_number,
-            metric1_value=set_data.metric1_value,
-            metric1_unit=set_data.metric1_unit,
-            metric2_value=set_data.metric2_value,
-            metric2_unit=set_data.metric2_unit,
+    Set counts are aggregated in SQL; no set rows are loaded. Use
+    GET /sessions/{id} for full detail.
+    """
+    query = (
+        db.query(
+            WorkoutSession.id,
+            WorkoutSession.name,
+            WorkoutSession.date,
+            func.count(WorkoutSet.id).label("set_count"),
         )
-        db.add(db_set)
+        .outerjoin(WorkoutSet, WorkoutSet.session_id == WorkoutSession.id)
+        .group_by(WorkoutSession.id)
+    )
+    if date_from:
+        query = query.filter(WorkoutSession.date >= date_from)
+    if date_to:
+        query = query.filter(WorkoutSession.date <= date_to)
+    rows = query.order_by(desc(WorkoutSession.date), desc(WorkoutSession.id)).all()
 
-    db.commit()
-    db.refresh(db_session)
-    return _serialize_session(db_session)
+    # Roll the per-session rows up into days (rows arrive grouped by date)
+    days = []
+    for row in rows:
+        if not days or days[-1]["date"] != row.date:
+            days.append({"date": row.date, "session_count": 0, "set_count": 0, "sessions": []})
+        day = days[-1]
+        day["session_count"] += 1
+        day["set_count"] += row.set_count
+        day["sessions"].append({"id": row.id, "name": row.name, "set_count": row.set_count})
+    return days
 
 
 @router.get("/sessions/latest-exercises-by-name", response_model=list[str])
+@db_endpoint
+@cached(list[str], tags=(SESSIONS, EXERCISES))
 def latest_exercises_by_name(name: str, db: Session = Depends(get_db)):
     """Get unique exercise names from the most recent session with a given name.
 
@@ -111,37 +619,40 @@ def latest_exercises_by_name(name: str, db: Session = Depends(get_db)):
     if not most_recent_session:
         return []
 
-    # Step 2: Get all sets from that session, ordered by pk
-    sets = (
-        db.query(WorkoutSet)
-        .filter(WorkoutSet.session_id == most_recent_session.id)
+    # Step 2: Get the exercise name of every set in that session, ordered by pk
+    exercise_names = db.scalars(
+        select(Exercise.name)
+        .join(WorkoutSet, WorkoutSet.exercise_id == Exercise.id)
+        .where(WorkoutSet.session_id == most_recent_session.id)
         .order_by(WorkoutSet.id)
-        .all()
-    )
+    ).all()
 
-    # Step 3: Extract unique exercise names (preserving order with dict.fromkeys)
-    exercise_names = [s.exercise.name for s in sets]
+    # Step 3: Deduplicate, preserving order with dict.fromkeys
     unique_names = list(dict.fromkeys(exercise_names))
 
     return unique_names
 
 
 @router.get("/sessions/{session_id}", response_model=WorkoutSessionRead)
+@db_endpoint
 def get_session(session_id: int, db: Session = Depends(get_db)):
     """Get session by ID with nested sets.
 
     Returns 404 if not found.
     """
-    db_session = db.query(WorkoutSession).filter(WorkoutSession.id == session_id).first()
-    if not db_session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session with id {session_id} not found",
-        )
-    return _serialize_session(db_session)
+    if fast_json.enabled("get_session"):
+        payloads = _session_payloads(*_session_rows(db, [WorkoutSession.id == session_id]))
+        if not payloads:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Session with id {session_id} not found",
+            )
+        return fast_json.json_response(payloads[0])
+    return _serialize_session(_get_session_or_404(db, session_id))
 
 
 @router.patch("/sessions/{session_id}", response_model=WorkoutSessionRead)
+@db_endpoint
 def patch_session(
     session_id: int,
     session_update: WorkoutSessionUpdate,
@@ -163,12 +674,21 @@ def patch_session(
     for field, value in update_data.items():
         setattr(db_session, field, value)
 
+    # Keep record and last-used dates in step with the session
+    if "date" in update_data:
+        db.query(ExerciseRecord).filter(ExerciseRecord.session_id == session_id).update(
+            {ExerciseRecord.achieved_on: db_session.date}, synchronize_session=False
+        )
+        db.flush()
+        rebuild_last_used(db, select(WorkoutSet.exercise_id).where(WorkoutSet.session_id == session_id))
+
+    bump_versions(db, SESSIONS)
     db.commit()
-    db.refresh(db_session)
-    return _serialize_session(db_session)
+    return _serialize_session(_get_session_or_404(db, session_id))
 
 
 @router.delete("/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+@db_endpoint
 def delete_session(session_id: int, db: Session = Depends(get_db)):
     """Delete session by ID (cascade deletes sets).
 
@@ -181,6 +701,20 @@ def delete_session(session_id: int, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Session with id {session_id} not found",
         )
+    # Records held by this session, and last-used dates it set, must be
+    # recomputed from remaining history
+    affected_exercise_ids = exercises_with_records_in_session(db, session_id)
+    last_used_here = db.scalars(
+        select(WorkoutSet.exercise_id)
+        .join(Exercise, Exercise.id == WorkoutSet.exercise_id)
+        .where(WorkoutSet.session_id == session_id, Exercise.last_used_on == db_session.date)
+        .distinct()
+    ).all()
     db.delete(db_session)
+    db.flush()
+    rebuild_records(db, affected_exercise_ids)
+    if last_used_here:
+        rebuild_last_used(db, last_used_here)
+    bump_versions(db, SESSIONS)
     db.commit()
     return None
@@ -0,0 +1,33 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database import db_endpoint, get_db
+from app.models import WorkoutSession
+from app.profiling import ProfiledRoute
+
+router = APIRouter(tags=["stats"], route_class=ProfiledRoute)
+
+
+@router.get("/stats/heatmap", response_model=dict[str, int])
+@db_endpoint
+def heatmap(
+    year: int = Query(..., ge=1900, le=9999),
+    db: Session = Depends(get_db),
+):
+    """Session count per date for one year, as {"YYYY-MM-DD": count}.
+
+    Days without sessions are omitted. Computed with a single GROUP BY over
+    the (date, id) index. ConditionalGetMiddleware answers If-None-Match
+    from the sessions version, so an unchanged heatmap is never recomputed.
+    """
+    rows = (
+        db.query(WorkoutSession.date, func.count(WorkoutSession.id))
+        .filter(WorkoutSession.date.between(date(year, 1, 1), date(year, 12, 31)))
+        .group_by(WorkoutSession.date)
+        .order_by(WorkoutSession.date)
+        .all()
+    )
+    return {day.isoformat(): count for day, count in rows}
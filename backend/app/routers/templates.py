@@ -1,64 +1,100 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, column, delete, func, insert, literal, select, update, values
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import IntegrityError
 
-from app.database import get_db
+from app.cache import cached
+from app.database import db_endpoint, get_db
 from app.models import Template, TemplateExercise, Exercise
+from app.profiling import ProfiledRoute
 from app.schemas import TemplateCreate, TemplateRead, TemplateExerciseRead
+from app.versions import EXERCISES, TEMPLATES, bump_versions
 
-router = APIRouter(tags=["templates"])
+router = APIRouter(tags=["templates"], route_class=ProfiledRoute)
+
+
+def _template_query(db: Session):
+    """Base template query that eager-loads each template's exercise list.
+
+    Serializing the result needs no further queries, which also keeps
+    returned templates usable after an async-mode session hands them back.
+    """
+    return db.query(Template).options(selectinload(Template.template_exercises))
+
+
+def _lock_template(db: Session, template_id: int) -> None:
+    """Lock the template row until commit; 404 if it doesn't exist.
+
+    Every change to a template's exercise list takes this lock first, so
+    concurrent edits of one template run one after another and never read
+    the same MAX(sort_order).
+    """
+    locked = db.scalar(
+        select(Template.id).where(Template.id == template_id).with_for_update()
+    )
+    if locked is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Template with id {template_id} not found",
+        )
 
 
 @router.get("/templates", response_model=list[TemplateRead])
+@db_endpoint
+@cached(list[TemplateRead], tags=(TEMPLATES, EXERCISES))
 def list_templates(db: Session = Depends(get_db)):
     """List all templates, ordered by name."""
-    templates = db.query(Template).order_by(Template.name).all()
+    templates = _template_query(db).order_by(Template.name).all()
     return templates
 
 
 @router.post("/templates", response_model=TemplateRead, status_code=status.HTTP_201_CREATED)
+@db_endpoint
 def create_template(template: TemplateCreate, db: Session = Depends(get_db)):
     """Create a new template.
 
     Returns 409 if name already exists (duplicate).
     """
-    db_template = Template(name=template.name)
-
-    # Add exercises if provided
+    # Validate all exercise ids in one lookup
     if template.exercise_ids:
-        for sort_order, exercise_id in enumerate(template.exercise_ids):
-            exercise = db.query(Exercise).filter(Exercise.id == exercise_id).first()
-            if not exercise:
+        found = set(db.scalars(select(Exercise.id).where(Exercise.id.in_(template.exercise_ids))))
+        for exercise_id in template.exercise_ids:
+            if exercise_id not in found:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Exercise with id {exercise_id} not found",
                 )
-            template_exercise = TemplateExercise(
-                exercise_id=exercise_id,
-                sort_order=sort_order
-            )
-            db_template.template_exercises.append(template_exercise)
 
+    db_template = Template(name=template.name)
     db.add(db_template)
     try:
+        db.flush()
+        template_id = db_template.id
+        if template.exercise_ids:
+            db.execute(insert(TemplateExercise), [
+                {"template_id": template_id, "exercise_id": exercise_id, "sort_order": sort_order}
+                for sort_order, exercise_id in enumerate(template.exercise_ids)
+            ])
+        bump_versions(db, TEMPLATES)
         db.commit()
-        db.refresh(db_template)
     except IntegrityError:
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Template with name '{template.name}' already exists",
         )
-    return db_template
+    return _template_query(db).filter(Template.id == template_id).one()
 
 
 @router.get("/templates/{template_id}", response_model=TemplateRead)
+@db_endpoint
+@cached(TemplateRead, tags=(TEMPLATES, EXERCISES))
 def get_template(template_id: int, db: Session = Depends(get_db)):
     """Get template by ID.
 
     Returns 404 if not found.
     """
-    template = db.query(Template).filter(Template.id == template_id).first()
+    template = _template_query(db).filter(Template.id == template_id).first()
     if not template:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -68,6 +104,7 @@ def get_template(template_id: int, db: Session = Depends(get_db)):
 
 
 @router.patch("/templates/{template_id}", response_model=TemplateRead)
+@db_endpoint
 def patch_template(
     template_id: int,
     template_update: TemplateCreate,
@@ -90,18 +127,19 @@ def patch_template(
         db_template.name = template_update.name
 
     try:
+        bump_versions(db, TEMPLATES)
         db.commit()
-        db.refresh(db_template)
     except IntegrityError:
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Template with name '{template_update.name}' already exists",
         )
-    return db_template
+    return _template_query(db).filter(Template.id == template_id).one()
 
 
 @router.delete("/templates/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
+@db_endpoint
 def delete_template(template_id: int, db: Session = Depends(get_db)):
     """Delete template by ID.
 
@@ -115,11 +153,13 @@ def delete_template(template_id: int, db: Session = Depends(get_db)):
             detail=f"Template with id {template_id} not found",
         )
     db.delete(db_template)
+    bump_versions(db, TEMPLATES)
     db.commit()
     return None
 
 
 @router.post("/templates/{template_id}/exercises", status_code=status.HTTP_201_CREATED)
+@db_endpoint
 def add_exercise_to_template(
     template_id: int,
     exercise_id: int,
@@ -130,55 +170,50 @@ def add_exercise_to_template(
     Returns 404 if template or exercise not found.
     Returns 409 if exercise already in template.
     """
-    template = db.query(Template).filter(Template.id == template_id).first()
-    if not template:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Template with id {template_id} not found",
-        )
+    _lock_template(db, template_id)
 
-    exercise = db.query(Exercise).filter(Exercise.id == exercise_id).first()
-    if not exercise:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Exercise with id {exercise_id} not found",
-        )
-
-    # Check if exercise already in template
-    existing = (
-        db.query(TemplateExercise)
-        .filter(
+    # Append at MAX(sort_order) + 1 in one statement; inserts nothing if the
+    # exercise doesn't exist or is already in the template
+    in_template = (
+        select(TemplateExercise.id)
+        .where(
             TemplateExercise.template_id == template_id,
             TemplateExercise.exercise_id == exercise_id,
         )
-        .first()
+        .exists()
+    )
+    next_sort_order = (
+        select(func.coalesce(func.max(TemplateExercise.sort_order) + 1, 0))
+        .where(TemplateExercise.template_id == template_id)
+        .scalar_subquery()
     )
-    if existing:
+    added = db.scalar(
+        insert(TemplateExercise)
+        .from_select(
+            ["template_id", "exercise_id", "sort_order"],
+            select(literal(template_id), Exercise.id, next_sort_order)
+            .where(Exercise.id == exercise_id, ~in_template),
+        )
+        .returning(TemplateExercise.id)
+    )
+    if added is None:
+        if db.get(Exercise, exercise_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Exercise with id {exercise_id} not found",
+            )
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Exercise {exercise_id} already in template {template_id}",
         )
 
-    # Get next sort_order
-    max_sort = (
-        db.query(TemplateExercise)
-        .filter(TemplateExercise.template_id == template_id)
-        .order_by(TemplateExercise.sort_order.desc())
-        .first()
-    )
-    next_sort_order = (max_sort.sort_order + 1) if max_sort else 0
-
-    template_exercise = TemplateExercise(
-        template_id=template_id,
-        exercise_id=exercise_id,
-        sort_order=next_sort_order,
-    )
-    db.add(template_exercise)
+    bump_versions(db, TEMPLATES)
     db.commit()
     return {"status": "added"}
 
 
 @router.delete("/templates/{template_id}/exercises/{exercise_id}", status_code=status.HTTP_204_NO_CONTENT)
+@db_endpoint
 def remove_exercise_from_template(
     template_id: int,
     exercise_id: int,
@@ -189,33 +224,29 @@ def remove_exercise_from_template(
     Returns 404 if template or exercise not found.
     Returns 204 (no content) on success.
     """
-    template = db.query(Template).filter(Template.id == template_id).first()
-    if not template:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Template with id {template_id} not found",
-        )
+    _lock_template(db, template_id)
 
-    template_exercise = (
-        db.query(TemplateExercise)
-        .filter(
+    removed = db.scalar(
+        delete(TemplateExercise)
+        .where(
             TemplateExercise.template_id == template_id,
             TemplateExercise.exercise_id == exercise_id,
         )
-        .first()
+        .returning(TemplateExercise.id)
     )
-    if not template_exercise:
+    if removed is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Exercise {exercise_id} not in template {template_id}",
         )
 
-    db.delete(template_exercise)
+    bump_versions(db, TEMPLATES)
     db.commit()
     return None
 
 
 @router.put("/templates/{template_id}/exercises/sort")
+@db_endpoint
 def sort_template_exercises(
     template_id: int,
     exercise_ids: list[int],
@@ -226,25 +257,24 @@ def sort_template_exercises(
     Exercise IDs provided in desired order.
     Returns 404 if template not found.
     """
-    template = db.query(Template).filter(Template.id == template_id).first()
-    if not template:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Template with id {template_id} not found",
-        )
-
-    # Update sort_order for each exercise
-    for sort_order, exercise_id in enumerate(exercise_ids):
-        template_exercise = (
-            db.query(TemplateExercise)
-            .filter(
+    _lock_template(db, template_id)
+
+    # One UPDATE ... FROM (VALUES ...) for the whole new order; ids not in
+    # the template match no row and are ignored
+    if exercise_ids:
+        new_order = values(
+            column("exercise_id", Integer), column("sort_order", Integer), name="new_order"
+        ).data([(exercise_id, sort_order) for sort_order, exercise_id in enumerate(exercise_ids)])
+        db.execute(
+            update(TemplateExercise)
+            .where(
                 TemplateExercise.template_id == template_id,
-                TemplateExercise.exercise_id == exercise_id,
+                TemplateExercise.exercise_id == new_order.c.exercise_id,
             )
-            .first()
+            .values(sort_order=new_order.c.sort_order)
+            .execution_options(synchronize_session=False)
         )
-        if template_exercise:
-            template_exercise.sort_order = sort_order
 
+    bump_versions(db, TEMPLATES)
     db.commit()
     return {"status": "sorted"}
@@ -1,3 +1,4 @@
+import datetime as dt
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import date, datetime
@@ -46,6 +47,49 @@ class ExerciseRead(ExerciseBase):
         from_attributes = True
 
 
+class ProgressBucketRead(BaseModel):
+    """Schema for one time bucket of per-exercise progress."""
+    period_start: date
+    set_count: int
+    top_set: Optional[float] = None
+    total_volume: Optional[float] = None
+    estimated_1rm: Optional[float] = None
+
+
+class ChartedExerciseRead(BaseModel):
+    """Schema for an exercise that has numeric data to chart."""
+    id: int
+    name: str
+
+
+class SeriesPointRead(BaseModel):
+    """Schema for one (date, value) point of an exercise time series."""
+    date: date
+    value: float
+
+
+class ExerciseSeriesRead(BaseModel):
+    """Schema for an aggregated per-date time series of one metric."""
+    exercise_id: int
+    metric: str
+    agg: str
+    unit: Optional[str] = None
+    points: List[SeriesPointRead] = []
+
+
+class ExerciseRecordRead(BaseModel):
+    """Schema for a personal record of an exercise."""
+    exercise_id: int
+    record_type: str
+    value: float
+    set_id: int
+    session_id: int
+    achieved_on: date
+
+    class Config:
+        from_attributes = True
+
+
 # ==================== WorkoutSet Schemas ====================
 
 class WorkoutSetBase(BaseModel):
@@ -81,6 +125,12 @@ class WorkoutSetRead(BaseModel):
         from_attributes = True
 
 
+class LatestSetsRequest(BaseModel):
+    """Schema for requesting latest sets of many exercises at once."""
+    names: List[str] = []
+    exercise_ids: List[int] = []
+
+
 # ==================== WorkoutSession Schemas ====================
 
 class WorkoutSessionBase(BaseModel):
@@ -97,7 +147,8 @@ class WorkoutSessionCreate(WorkoutSessionBase):
 class WorkoutSessionUpdate(BaseModel):
     """Schema for updating a session (all fields optional)."""
     name: Optional[str] = None
-    date: Optional[date] = None
+    # dt.date: with a default, a bare `date` annotation resolves to the field itself
+    date: Optional[dt.date] = None
 
 
 class WorkoutSessionRead(WorkoutSessionBase):
@@ -110,6 +161,42 @@ class WorkoutSessionRead(WorkoutSessionBase):
         from_attributes = True
 
 
+class SessionSummaryRead(BaseModel):
+    """Schema for a session summary (no nested sets)."""
+    id: int
+    name: str
+    set_count: int
+
+
+class DaySummaryRead(BaseModel):
+    """Schema for per-day session aggregates used by the calendar view."""
+    date: date
+    session_count: int
+    set_count: int
+    sessions: List[SessionSummaryRead] = []
+
+
+class BulkRowError(BaseModel):
+    """A rejected row in a bulk session import."""
+    row: int
+    detail: str
+
+
+class BulkChunkResult(BaseModel):
+    """Outcome of one chunk (transaction) of a bulk session import."""
+    chunk: int
+    sessions_inserted: int
+    sets_inserted: int
+    errors: List[BulkRowError] = []
+
+
+class BulkImportResult(BaseModel):
+    """Totals and per-chunk results of a bulk session import."""
+    sessions_inserted: int
+    sets_inserted: int
+    chunks: List[BulkChunkResult] = []
+
+
 # ==================== Template Schemas ====================
 
 class TemplateExerciseRead(BaseModel):
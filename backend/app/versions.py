@@ -0,0 +1,159 @@
+"""Per-resource change counters and change notifications.
+
+Every write endpoint calls bump_versions() inside its transaction, so a
+resource's version changes exactly when its data does. Readers compare
+versions instead of re-running queries (see app.etag).
+
+The bump also issues a transactional pg_notify, so on commit every worker
+(through start_change_listener) and the committing worker itself (through
+an after_commit hook) run the callbacks registered with on_change().
+"""
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Optional
+
+from sqlalchemy import Connection, create_engine, event, func, select as sql_select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.database import SessionLocal, engine
+from app.models import ResourceVersion
+
+logger = logging.getLogger(__name__)
+
+EXERCISES = "exercises"
+SESSIONS = "sessions"
+TEMPLATES = "templates"
+RESOURCES = (EXERCISES, SESSIONS, TEMPLATES)
+
+# Postgres channel carrying the name of each changed resource
+CHANGE_CHANNEL = "smart_logger_changes"
+
+_callbacks: dict[str, list[Callable[[], None]]] = defaultdict(list)
+
+
+def on_change(resource: str, callback: Callable[[], None]) -> None:
+    """Run callback whenever a write to resource commits, in any worker."""
+    _callbacks[resource].append(callback)
+
+
+def _notify_local(resources) -> None:
+    for resource in resources:
+        for callback in _callbacks[resource]:
+            callback()
+
+
+def bump_versions(db: Session, *resources: str) -> None:
+    """Increment the given resources' versions in the current transaction."""
+    stmt = insert(ResourceVersion).values(
+        [{"resource": resource, "version": 1} for resource in resources]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ResourceVersion.resource],
+        set_={"version": ResourceVersion.version + 1},
+    )
+    db.execute(stmt)
+    # Delivered to listeners only if the transaction commits
+    db.execute(sql_select(*(func.pg_notify(CHANGE_CHANNEL, resource) for resource in resources)))
+    db.info.setdefault("changed_resources", set()).update(resources)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _after_commit(db: Session) -> None:
+    _notify_local(db.info.pop("changed_resources", ()))
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _after_rollback(db: Session) -> None:
+    db.info.pop("changed_resources", None)
+
+
+def read_versions(conn: Connection) -> dict[str, int]:
+    """Current version of every resource (0 if never written)."""
+    rows = conn.execute(text("SELECT resource, version FROM api_resource_version")).all()
+    versions = dict.fromkeys(RESOURCES, 0)
+    versions.update((resource, version) for resource, version in rows)
+    return versions
+
+
+class _VersionCache:
+    """Resource versions kept in memory, dropped on every change notification."""
+
+    def __init__(self):
+        self._versions = None
+        self._generation = 0
+
+    def invalidate(self) -> None:
+        self._versions = None
+        self._generation += 1
+
+    def get(self, db: Optional[Session] = None) -> dict[str, int]:
+        versions = self._versions
+        if versions is None:
+            generation = self._generation
+            if db is not None:
+                versions = read_versions(db.connection())
+            else:
+                with engine.connect() as conn:
+                    versions = read_versions(conn)
+            # Don't cache a read that raced with an invalidation
+            if generation == self._generation:
+                self._versions = versions
+        return versions
+
+
+_version_cache = _VersionCache()
+for _resource in RESOURCES:
+    on_change(_resource, _version_cache.invalidate)
+
+
+def current_versions(db: Optional[Session] = None) -> dict[str, int]:
+    """Current resource versions, from memory when no change has been seen.
+
+    A reload goes through db when given, otherwise through a pooled sync
+    connection. Code running inside AsyncSession.run_sync must pass its
+    session: the sync engine would block the event loop.
+    """
+    return _version_cache.get(db)
+
+
+def _listen_forever() -> None:
+    """LISTEN on the change channel and dispatch notifications from other workers.
+
+    Reconnects after errors; everything is invalidated on reconnect since
+    notifications may have been missed meanwhile. The connection is held for
+    the life of the process, so it comes from its own unpooled engine rather
+    than taking one of the request pool's slots.
+    """
+    listen_engine = create_engine(engine.url, poolclass=NullPool)
+    while True:
+        try:
+            conn = listen_engine.raw_connection()
+            try:
+                dbapi_conn = conn.driver_connection
+                dbapi_conn.autocommit = True
+                dbapi_conn.cursor().execute(f"LISTEN {CHANGE_CHANNEL}")
+                _notify_local(RESOURCES)
+                while True:
+                    if select.select([dbapi_conn], [], [], 60) == ([], [], []):
+                        continue
+                    dbapi_conn.poll()
+                    changed = {n.payload for n in dbapi_conn.notifies}
+                    dbapi_conn.notifies.clear()
+                    _notify_local(changed)
+            finally:
+                conn.invalidate()
+        except Exception:
+            logger.exception("Change listener failed, reconnecting")
+            time.sleep(5)
+
+
+def start_change_listener() -> None:
+    """Start the background LISTEN thread (PostgreSQL only)."""
+    if engine.dialect.name != "postgresql":
+        return
+    threading.Thread(target=_listen_forever, name="change-listener", daemon=True).start()
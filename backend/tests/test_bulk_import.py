@@ -0,0 +1,31 @@
+"""POST /api/sessions/bulk error reporting."""
+import json
+
+
+def _session(day: int, exercise: str = "Squat") -> dict:
+    return {
+        "name": "Imported",
+        "date": f"2021-01-{day:02d}",
+        "sets": [{"exercise": exercise, "set_number": 1, "metric1_value": "100", "metric2_value": "5"}],
+    }
+
+
+def test_malformed_array_stops_with_400(client, exercises):
+    rows = ",".join(json.dumps(_session(day)) for day in range(1, 4))
+    body = f'[{rows}, {{"name": "broken", ]'
+
+    response = client.post("/api/sessions/bulk?chunk_size=2", content=body)
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid JSON in array element 4:")
+    # The first chunk was committed before the bad element was reached
+    assert len(client.get("/api/sessions").json()) == 2
+
+
+def test_ndjson_bad_line_is_a_row_error(client, exercises):
+    body = "\n".join([json.dumps(_session(1)), "{not json", json.dumps(_session(2, "Unknown"))])
+
+    result = client.post("/api/sessions/bulk", content=body).json()
+
+    assert result["sessions_inserted"] == 1
+    assert [e["row"] for e in result["chunks"][0]["errors"]] == [2, 3]
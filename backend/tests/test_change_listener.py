@@ -0,0 +1,22 @@
+"""The LISTEN thread must deliver notifications without holding a pool connection."""
+import threading
+
+from sqlalchemy import func, select
+
+from app import versions
+from app.database import engine
+
+
+def test_listener_dispatches_without_pool_connection(monkeypatch):
+    received = threading.Event()
+    monkeypatch.setitem(versions._callbacks, "listener-test", [received.set])
+    versions.start_change_listener()
+
+    # Notify until the thread has subscribed and passed one on
+    for _ in range(50):
+        with engine.begin() as conn:
+            conn.execute(select(func.pg_notify(versions.CHANGE_CHANNEL, "listener-test")))
+        if received.wait(0.1):
+            break
+    assert received.is_set()
+    assert engine.pool.checkedout() == 0
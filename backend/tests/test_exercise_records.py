@@ -0,0 +1,23 @@
+"""Personal records follow edits to the exercises that hold them."""
+
+
+def _record_types(client, exercise_id: int) -> set[str]:
+    response = client.get(f"/api/exercises/{exercise_id}/records")
+    assert response.status_code == 200
+    return {r["record_type"] for r in response.json()}
+
+
+def test_patch_category_type_rebuilds_records(client, exercises):
+    created = client.post("/api/sessions", json={
+        "name": "Mixed",
+        "date": "2024-03-01",
+        "sets": [{"exercise": "Row", "set_number": 1, "metric1_value": "30", "metric1_unit": "min", "metric2_value": "5"}],
+    })
+    assert created.status_code == 201
+    row_id = exercises["Row"]
+    assert _record_types(client, row_id) == {"max_weight", "max_reps", "max_e1rm", "max_set_volume"}
+
+    response = client.patch(f"/api/exercises/{row_id}", json={"category_type": "cardio"})
+
+    assert response.status_code == 200
+    assert _record_types(client, row_id) == {"max_distance", "longest_duration"}
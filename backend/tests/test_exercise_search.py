@@ -0,0 +1,89 @@
+"""Exercise search ranking, and the last-used dates it ranks by."""
+import datetime
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.catalog import catalog
+from app.exercise_search import search_exercise_ids
+from app.models import Exercise
+from app.versions import EXERCISES, bump_versions
+
+
+@pytest.fixture
+def catalog_ids(db):
+    """A small catalog with one cardio exercise; returns {name: id}."""
+    rows = [
+        ("Bench Press", "strength"), ("Bench Dip", "strength"), ("Incline Bench Press", "strength"),
+        ("Deadlift", "strength"), ("Squat", "strength"), ("Bench Step-Up", "cardio"),
+    ]
+    ids = db.scalars(
+        insert(Exercise).returning(Exercise.id, sort_by_parameter_order=True),
+        [{"name": name, "category_type": category_type} for name, category_type in rows],
+    ).all()
+    bump_versions(db, EXERCISES)
+    db.commit()
+    return dict(zip((name for name, _ in rows), ids))
+
+
+def _log(client, date: str, *names: str) -> int:
+    sets = [{"exercise": name, "set_number": n + 1, "metric1_value": "100"} for n, name in enumerate(names)]
+    response = client.post("/api/sessions", json={"name": "Log", "date": date, "sets": sets})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _last_used(db) -> dict[str, datetime.date]:
+    db.expire_all()
+    rows = db.execute(select(Exercise.name, Exercise.last_used_on).where(Exercise.last_used_on.isnot(None)))
+    return dict(rows.all())
+
+
+def _search(client, **params) -> list[str]:
+    response = client.get("/api/exercises/search", params=params)
+    assert response.status_code == 200
+    return [exercise["name"] for exercise in response.json()]
+
+
+def test_last_used_follows_session_writes(client, db, catalog_ids):
+    newer = _log(client, "2024-01-10", "Squat", "Deadlift")
+    older = _log(client, "2024-01-05", "Squat", "Bench Dip")
+    assert _last_used(db) == {
+        "Squat": datetime.date(2024, 1, 10),
+        "Deadlift": datetime.date(2024, 1, 10),
+        "Bench Dip": datetime.date(2024, 1, 5),
+    }
+
+    # Moving a session earlier falls back to the next newest use
+    client.patch(f"/api/sessions/{newer}", json={"date": "2024-01-01"})
+    assert _last_used(db)["Squat"] == datetime.date(2024, 1, 5)
+    assert _last_used(db)["Deadlift"] == datetime.date(2024, 1, 1)
+
+    client.delete(f"/api/sessions/{older}")
+    assert _last_used(db) == {"Squat": datetime.date(2024, 1, 1), "Deadlift": datetime.date(2024, 1, 1)}
+
+    bulk = '{"name": "Import", "date": "2024-02-01", "sets": [{"exercise": "Bench Press", "set_number": 1}]}'
+    response = client.post("/api/sessions/bulk", content=bulk, headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert _last_used(db)["Bench Press"] == datetime.date(2024, 2, 1)
+
+
+def test_search_ranks_by_tier_then_recency(client, catalog_ids):
+    _log(client, "2024-01-10", "Bench Dip")
+    assert _search(client, q="bench", category_type="strength") == [
+        "Bench Dip", "Bench Press", "Incline Bench Press",
+    ]
+    assert _search(client, q="Bench Press")[:2] == ["Bench Press", "Incline Bench Press"]
+    assert _search(client, q="dedlift") == ["Deadlift"]
+    assert _search(client, q="be", category_type="cardio") == ["Bench Step-Up"]
+    assert _search(client, q="", limit=3) == ["Bench Dip", "Bench Press", "Bench Step-Up"]
+
+
+def test_search_limit_counts_only_snapshot_exercises(db, catalog_ids):
+    snapshot = catalog.snapshot(db)
+    # Newer than the snapshot, and the best match for the query
+    db.add(Exercise(name="Bench", category_type="strength"))
+    db.commit()
+
+    ids = search_exercise_ids(db, snapshot, "bench", limit=2)
+    assert ids == [catalog_ids["Bench Dip"], catalog_ids["Bench Press"]]
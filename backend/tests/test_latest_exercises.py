@@ -0,0 +1,15 @@
+"""GET /api/sessions/latest-exercises-by-name must not load exercises per set."""
+from tests.conftest import EXERCISE_NAMES
+
+
+def test_latest_exercises_statements_do_not_grow(client, seed_history, count_statements):
+    counts = []
+    for sets in (1, len(EXERCISE_NAMES)):
+        seed_history(1, sets)
+        response, statements = count_statements(
+            client.get, "/api/sessions/latest-exercises-by-name", params={"name": "Seeded"}
+        )
+        assert response.json() == EXERCISE_NAMES[:sets]
+        counts.append(statements)
+    small, large = counts
+    assert small == large
@@ -0,0 +1,28 @@
+"""The batched latest-sets endpoint must agree with the per-name one."""
+from app.models import Exercise
+from app.versions import EXERCISES, bump_versions
+from tests.conftest import EXERCISE_NAMES
+
+
+def test_latest_sets_batch_matches_single(client, db, exercises, seed_history):
+    seed_history(4, 7)
+    curl = Exercise(name="Curl", category_type="strength")
+    db.add(curl)
+    bump_versions(db, EXERCISES)
+    db.commit()
+    never_logged = curl.id
+    names = EXERCISE_NAMES[:3] + ["Curl", "Unknown"]
+    ids = [exercises["Row"], never_logged]
+
+    response = client.post("/api/exercises/latest-sets", json={"names": names, "exercise_ids": ids})
+    assert response.status_code == 200
+    result = response.json()
+
+    assert set(result) == set(names) | {str(i) for i in ids}
+    for name in EXERCISE_NAMES[:3]:
+        single = client.get("/api/exercises/latest-sets-by-name", params={"name": name}).json()
+        assert single and result[name] == single
+    assert result[str(exercises["Row"])] == client.get(
+        "/api/exercises/latest-sets-by-name", params={"name": "Row"}
+    ).json()
+    assert result["Curl"] == result["Unknown"] == result[str(never_logged)] == []
@@ -0,0 +1,37 @@
+"""Cached endpoints must reload resource versions through the request's session."""
+import asyncio
+
+from app import versions
+from app.database import AsyncSessionLocal, async_engine
+from app.routers.exercises import latest_sets_by_name
+from app.versions import RESOURCES, _notify_local
+
+
+class _NoEngine:
+    def connect(self):
+        raise AssertionError("versions were read outside the request's session")
+
+
+def _call(endpoint, db, **kwargs):
+    """Call a db_endpoint the way its mode expects: directly, or with an async session."""
+    if async_engine is None:
+        return endpoint(db=db, **kwargs)
+
+    async def run():
+        try:
+            async with AsyncSessionLocal() as session:
+                return await endpoint(db=session, **kwargs)
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_cache_key_reads_versions_through_request_session(db, seed_history, monkeypatch):
+    seed_history(2, 3)
+    _notify_local(RESOURCES)
+    monkeypatch.setattr(versions, "engine", _NoEngine())
+
+    response = _call(latest_sets_by_name, db, name="Squat")
+    assert response.status_code == 200
+    assert versions.current_versions(db) == versions.read_versions(db.connection())
@@ -0,0 +1,42 @@
+"""Personal records follow edits to the sessions that hold them."""
+
+
+def _records(client) -> list[dict]:
+    response = client.get("/api/exercises/records")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_patch_session_date_updates_records(client, exercises):
+    created = client.post("/api/sessions", json={
+        "name": "Legs",
+        "date": "2024-03-01",
+        "sets": [{"exercise": "Squat", "set_number": 1, "metric1_value": "225", "metric1_unit": "lbs", "metric2_value": "5"}],
+    })
+    assert created.status_code == 201
+    session_id = created.json()["id"]
+    records = _records(client)
+    assert records and {r["achieved_on"] for r in records} == {"2024-03-01"}
+
+    response = client.patch(f"/api/sessions/{session_id}", json={"date": "2024-03-05"})
+
+    assert response.status_code == 200
+    assert response.json()["date"] == "2024-03-05"
+    records = _records(client)
+    assert {r["session_id"] for r in records} == {session_id}
+    assert {r["achieved_on"] for r in records} == {"2024-03-05"}
+
+
+def test_patch_session_name_leaves_records(client, exercises):
+    created = client.post("/api/sessions", json={
+        "name": "Legs",
+        "date": "2024-03-01",
+        "sets": [{"exercise": "Squat", "set_number": 1, "metric1_value": "225", "metric2_value": "5"}],
+    }).json()
+    before = _records(client)
+
+    response = client.patch(f"/api/sessions/{created['id']}", json={"name": "Leg Day"})
+
+    assert response.status_code == 200
+    assert response.json()["date"] == "2024-03-01"
+    assert _records(client) == before
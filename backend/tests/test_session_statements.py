@@ -0,0 +1,103 @@
+"""SQL statements per session endpoint call must not grow with data size."""
+import pytest
+
+from app import fast_json
+from tests.conftest import EXERCISE_NAMES
+
+# (sessions, sets per session) seeded before each measurement
+SIZES = [(3, 2), (30, 10)]
+
+
+def _sets_payload(count: int) -> list[dict]:
+    return [
+        {
+            "exercise": EXERCISE_NAMES[n % len(EXERCISE_NAMES)],
+            "set_number": n + 1,
+            "metric1_value": str(100 + n),
+            "metric1_unit": "lbs",
+            "metric2_value": "5",
+        }
+        for n in range(count)
+    ]
+
+
+def _statements_per_size(seed_history, measure) -> list[int]:
+    """Grow the history through SIZES, returning measure(session_id, sets) after each step.
+
+    session_id is the newest seeded session; sets is that step's sets per session.
+    """
+    counts = []
+    for sessions, sets_per_session in SIZES:
+        session_ids = seed_history(sessions, sets_per_session)
+        counts.append(measure(session_ids[-1], sets_per_session))
+    return counts
+
+
+@pytest.fixture(params=["fast", "validated"])
+def json_path(request, monkeypatch):
+    """Run a read test on both the single-pass JSON and the ORM/response_model path."""
+    if request.param == "validated":
+        monkeypatch.setattr(fast_json, "FAST_JSON_ROUTES", {"none"})
+    return request.param
+
+
+def test_list_sessions(client, seed_history, count_statements, json_path):
+    def measure(session_id, sets):
+        client.get("/api/sessions")  # Warm per-process caches
+        response, statements = count_statements(client.get, "/api/sessions")
+        assert response.status_code == 200
+        assert len(response.json()[0]["sets"]) == sets
+        return statements
+
+    small, large = _statements_per_size(seed_history, measure)
+    assert small == large
+
+
+def test_list_sessions_page(client, seed_history, count_statements, json_path):
+    def measure(session_id, sets):
+        client.get("/api/sessions?limit=20")
+        response, statements = count_statements(client.get, "/api/sessions?limit=20")
+        assert response.status_code == 200
+        return statements
+
+    small, large = _statements_per_size(seed_history, measure)
+    assert small == large
+
+
+def test_get_session(client, seed_history, count_statements, json_path):
+    def measure(session_id, sets):
+        client.get(f"/api/sessions/{session_id}")
+        response, statements = count_statements(client.get, f"/api/sessions/{session_id}")
+        assert response.status_code == 200
+        assert len(response.json()["sets"]) == sets
+        return statements
+
+    small, large = _statements_per_size(seed_history, measure)
+    assert small == large
+
+
+def test_create_session(client, seed_history, count_statements):
+    def measure(session_id, sets):
+        payload = {"name": "Push", "date": "2030-01-01", "sets": _sets_payload(sets)}
+        client.post("/api/sessions", json=payload)
+        response, statements = count_statements(client.post, "/api/sessions", json=payload)
+        assert response.status_code == 201
+        assert len(response.json()["sets"]) == sets
+        return statements
+
+    small, large = _statements_per_size(seed_history, measure)
+    assert small == large
+
+
+def test_patch_session(client, seed_history, count_statements):
+    def measure(session_id, sets):
+        client.patch(f"/api/sessions/{session_id}", json={"name": "Warm-up"})
+        response, statements = count_statements(
+            client.patch, f"/api/sessions/{session_id}", json={"name": "Renamed"}
+        )
+        assert response.status_code == 200
+        assert len(response.json()["sets"]) == sets
+        return statements
+
+    small, large = _statements_per_size(seed_history, measure)
+    assert small == large
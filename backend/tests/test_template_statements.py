@@ -0,0 +1,88 @@
+"""SQL statements per template mutation must not grow with template size."""
+import pytest
+from sqlalchemy import insert
+
+from app.models import Exercise
+from app.versions import EXERCISES, bump_versions
+
+# Exercises in the template being measured
+SIZES = [2, 20]
+
+
+@pytest.fixture
+def exercise_ids(db):
+    """Create enough exercises for the largest template plus spares to add."""
+    ids = db.scalars(
+        insert(Exercise).returning(Exercise.id, sort_by_parameter_order=True),
+        [{"name": f"Exercise {n}", "category_type": "strength"} for n in range(max(SIZES) + 4)],
+    ).all()
+    bump_versions(db, EXERCISES)
+    db.commit()
+    return list(ids)
+
+
+@pytest.fixture
+def make_template(client, exercise_ids):
+    """Return make(size) -> id of a new template holding the first size exercises."""
+    names = iter(range(1000))
+
+    def make(size: int) -> int:
+        response = client.post(
+            "/api/templates",
+            json={"name": f"Template {next(names)}", "exercise_ids": exercise_ids[:size]},
+        )
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    return make
+
+
+def _exercise_order(client, template_id: int) -> list[int]:
+    template = client.get(f"/api/templates/{template_id}").json()
+    entries = sorted(template["template_exercises"], key=lambda te: te["sort_order"])
+    return [te["exercise_id"] for te in entries]
+
+
+def test_create_template(client, exercise_ids, count_statements):
+    counts = []
+    for size in SIZES:
+        payload = {"exercise_ids": exercise_ids[:size]}
+        client.post("/api/templates", json={"name": f"Warm-up {size}", **payload})
+        response, statements = count_statements(
+            client.post, "/api/templates", json={"name": f"Measured {size}", **payload}
+        )
+        assert response.status_code == 201
+        assert len(response.json()["template_exercises"]) == size
+        counts.append(statements)
+    small, large = counts
+    assert small == large
+
+
+def test_add_exercise_to_template(client, exercise_ids, make_template, count_statements):
+    spare_warm, spare_measured = exercise_ids[-2:]
+    counts = []
+    for size in SIZES:
+        template_id = make_template(size)
+        url = f"/api/templates/{template_id}/exercises"
+        client.post(url, params={"exercise_id": spare_warm})
+        response, statements = count_statements(client.post, url, params={"exercise_id": spare_measured})
+        assert response.status_code == 201
+        counts.append(statements)
+        assert _exercise_order(client, template_id)[-1] == spare_measured
+    small, large = counts
+    assert small == large
+
+
+def test_sort_template_exercises(client, exercise_ids, make_template, count_statements):
+    counts = []
+    for size in SIZES:
+        template_id = make_template(size)
+        url = f"/api/templates/{template_id}/exercises/sort"
+        order = exercise_ids[:size][::-1]
+        client.put(url, json=exercise_ids[:size])
+        response, statements = count_statements(client.put, url, json=order)
+        assert response.status_code == 200
+        counts.append(statements)
+        assert _exercise_order(client, template_id) == order
+    small, large = counts
+    assert small == large
@@ -2,7 +2,17 @@
  * Typed API client for Smart Logger backend
  */
 
-import { Exercise, WorkoutSet, Session, SessionCreate, Template, TemplateCreate } from './types'
+import {
+  ChartedExercise,
+  ColumnarSessions,
+  Exercise,
+  ExerciseSeries,
+  WorkoutSet,
+  Session,
+  SessionCreate,
+  Template,
+  TemplateCreate,
+} from './types'
 
 const API_URL = import.meta.env.VITE_API_URL || '/api'
 
@@ -20,20 +30,123 @@ export async function fetchExercises(): Promise<Exercise[]> {
   }
 }
 
+/**
+ * Search exercises by name on the server, best matches first
+ */
+export async function searchExercises(
+  query: string,
+  categoryTypes: string[] = [],
+  limit = 100
+): Promise<Exercise[]> {
+  try {
+    const params = new URLSearchParams({ q: query, limit: String(limit) })
+    categoryTypes.forEach((categoryType) => params.append('category_type', categoryType))
+    const response = await fetch(`${API_URL}/exercises/search?${params}`)
+    if (!response.ok) throw new Error('Failed to search exercises')
+    return await response.json()
+  } catch (error) {
+    console.error('Error searching exercises:', error)
+    return []
+  }
+}
+
+/**
+ * Rebuild nested sessions from the columnar (dictionary-encoded) format
+ */
+function decodeColumnarSessions(data: ColumnarSessions): Session[] {
+  const { sessions: s, sets, exercises, units } = data
+  const unit = (code: number | null) => (code === null ? null : units[code])
+  const byId = new Map<number, Session>()
+  const result = s.id.map((id, i) => {
+    const session: Session = {
+      id,
+      name: s.name[i],
+      date: s.date[i],
+      created_at: s.created_at[i],
+      sets: [],
+    }
+    byId.set(id, session)
+    return session
+  })
+  sets.id.forEach((id, i) => {
+    byId.get(sets.session_id[i])?.sets.push({
+      id,
+      exercise: exercises[sets.exercise[i]],
+      set_number: sets.set_number[i],
+      metric1_value: sets.metric1_value[i],
+      metric1_unit: unit(sets.metric1_unit[i]),
+      metric2_value: sets.metric2_value[i],
+      metric2_unit: unit(sets.metric2_unit[i]),
+      metric3_value: sets.metric3_value[i],
+      metric3_unit: unit(sets.metric3_unit[i]),
+    })
+  })
+  return result
+}
+
 /**
  * Fetch all sessions with nested sets
+ * Uses the columnar format: a fraction of the bytes and parse time for long histories
  */
 export async function fetchSessions(): Promise<Session[]> {
   try {
-    const response = await fetch(`${API_URL}/sessions`)
+    const response = await fetch(`${API_URL}/sessions?format=columnar`)
     if (!response.ok) throw new Error('Failed to fetch sessions')
-    return await response.json()
+    return decodeColumnarSessions(await response.json())
   } catch (error) {
     console.error('Error fetching sessions:', error)
     return []
   }
 }
 
+/**
+ * Fetch per-date session counts for one year (contribution graph)
+ */
+export async function fetchHeatmap(year: number): Promise<Record<string, number>> {
+  try {
+    const response = await fetch(`${API_URL}/stats/heatmap?year=${year}`)
+    if (!response.ok) throw new Error('Failed to fetch heatmap')
+    return await response.json()
+  } catch (error) {
+    console.error(`Error fetching heatmap for ${year}:`, error)
+    return {}
+  }
+}
+
+/**
+ * Fetch exercises that have numeric weight data to chart
+ */
+export async function fetchChartedExercises(): Promise<ChartedExercise[]> {
+  try {
+    const response = await fetch(`${API_URL}/exercises/charted`)
+    if (!response.ok) throw new Error('Failed to fetch charted exercises')
+    return await response.json()
+  } catch (error) {
+    console.error('Error fetching charted exercises:', error)
+    return []
+  }
+}
+
+/**
+ * Fetch a per-date aggregated metric series for one exercise
+ */
+export async function fetchExerciseSeries(
+  exerciseId: number,
+  metric = 'metric1',
+  agg = 'max'
+): Promise<ExerciseSeries | null> {
+  try {
+    const response = await fetch(
+      `${API_URL}/exercises/${exerciseId}/series?metric=${metric}&agg=${agg}`
+    )
+    if (!response.ok) throw new Error('Failed to fetch exercise series')
+    return await response.json()
+  } catch (error) {
+    console.error(`Error fetching series for exercise ${exerciseId}:`, error)
+    return null
+  }
+}
+
 /**
  * Fetch latest sets for a given exercise name
  */
@@ -49,6 +162,28 @@ export async function fetchLatestSets(exerciseName: string): Promise<WorkoutSet[
   }
 }
 
+/**
+ * Fetch latest sets for many exercise names in one request
+ */
+export async function fetchLatestSetsBatch(
+  exerciseNames: string[]
+): Promise<{ [exerciseName: string]: WorkoutSet[] }> {
+  try {
+    const response = await fetch(`${API_URL}/exercises/latest-sets`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ names: exerciseNames }),
+    })
+    if (!response.ok) throw new Error('Failed to fetch latest sets')
+    return await response.json()
+  } catch (error) {
+    console.error('Error fetching latest sets:', error)
+    return {}
+  }
+}
+
 /**
  * Fetch unique exercise names from the latest session with given name
  */
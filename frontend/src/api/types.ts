@@ -16,6 +16,24 @@ export interface Exercise {
   field_config?: Record<string, unknown> | null
 }
 
+export interface ChartedExercise {
+  id: number
+  name: string
+}
+
+export interface SeriesPoint {
+  date: string
+  value: number
+}
+
+export interface ExerciseSeries {
+  exercise_id: number
+  metric: string
+  agg: string
+  unit: string | null
+  points: SeriesPoint[]
+}
+
 export interface WorkoutSet {
   id: number
   exercise: string
@@ -36,6 +54,30 @@ export interface Session {
   sets: WorkoutSet[]
 }
 
+// GET /sessions?format=columnar: parallel arrays, names and units as dictionary codes
+export interface ColumnarSessions {
+  sessions: {
+    id: number[]
+    name: string[]
+    date: string[]
+    created_at: string[]
+  }
+  sets: {
+    session_id: number[]
+    id: number[]
+    exercise: number[]
+    set_number: number[]
+    metric1_value: (string | null)[]
+    metric1_unit: (number | null)[]
+    metric2_value: (string | null)[]
+    metric2_unit: (number | null)[]
+    metric3_value: (string | null)[]
+    metric3_unit: (number | null)[]
+  }
+  exercises: string[]
+  units: string[]
+}
+
 export interface WorkoutSetCreate {
   exercise: string
   set_number: number
@@ -3,7 +3,7 @@
  */
 
 import { useState, useMemo } from 'react'
-import { useExercises } from '../hooks/useExercises'
+import { useExerciseSearch, useExercises } from '../hooks/useExercises'
 import { useAddExerciseToTemplate } from '../hooks/useTemplates'
 import { useQueryClient } from '@tanstack/react-query'
 import ExerciseSearchInput from './ExerciseSearchInput'
@@ -55,27 +55,25 @@ export default function AddExerciseModal({
     return selectedCategories
   }, [selectedCategories, categoryCounts])
 
+  // Ranked server-side matches while a search query is entered
+  const isSearching = searchQuery.trim() !== ''
+  const { data: searchResults = [], isLoading: searchLoading } = useExerciseSearch(
+    searchQuery,
+    selectedCategories
+  )
+
   // Filter exercises
   const filteredExercises = useMemo(() => {
-    return exercises.filter((ex) => {
+    return (isSearching ? searchResults : exercises).filter((ex) => {
       // Exclude already-added exercises
       if (templateExerciseIds.includes(ex.id)) {
         return false
       }
 
       // Filter by category
-      if (!categoriesToShow.includes(ex.category_type)) {
-        return false
-      }
-
-      // Filter by search query
-      if (searchQuery.trim()) {
-        return ex.name.toLowerCase().includes(searchQuery.toLowerCase())
-      }
-
-      return true
+      return categoriesToShow.includes(ex.category_type)
     })
-  }, [exercises, templateExerciseIds, categoriesToShow, searchQuery])
+  }, [exercises, searchResults, isSearching, templateExerciseIds, categoriesToShow])
 
   const handleSelectionChange = (id: number, selected: boolean) => {
     const newSelected = new Set(selectedExerciseIds)
@@ -155,7 +153,7 @@ export default function AddExerciseModal({
             exercises={filteredExercises}
             selectedIds={selectedExerciseIds}
             onSelectionChange={handleSelectionChange}
-            isLoading={exercisesLoading}
+            isLoading={exercisesLoading || (isSearching && searchLoading)}
           />
         </div>
 
@@ -3,24 +3,16 @@
  */
 
 import { useMemo } from 'react'
-import { Session } from '../api/types'
 
 interface ContributionGraphProps {
-  sessions: Session[]
+  counts: Record<string, number> // YYYY-MM-DD → session count, from /stats/heatmap
   year: number
   onYearChange: (year: number) => void
 }
 
-export default function ContributionGraph({ sessions, year, onYearChange }: ContributionGraphProps) {
+export default function ContributionGraph({ counts, year, onYearChange }: ContributionGraphProps) {
   // Build date → count map
-  const dateCountMap = useMemo(() => {
-    const map = new Map<string, number>()
-    sessions.forEach((session) => {
-      const dateStr = session.date.split('T')[0] // YYYY-MM-DD
-      map.set(dateStr, (map.get(dateStr) || 0) + 1)
-    })
-    return map
-  }, [sessions])
+  const dateCountMap = useMemo(() => new Map(Object.entries(counts)), [counts])
 
   // Calculate full calendar year grid
   const today = new Date()
@@ -6,7 +6,7 @@
 
 import { useState, useEffect } from 'react'
 import { Exercise, WorkoutSet } from '../api/types'
-import { fetchLatestSets } from '../api/client'
+import { fetchLatestSets, fetchLatestSetsBatch } from '../api/client'
 import StrengthExerciseCard from './StrengthExerciseCard'
 import SingleEntryExerciseCard from './SingleEntryExerciseCard'
 import FlexibilityExerciseCard from './FlexibilityExerciseCard'
@@ -82,21 +82,20 @@ export default function LoggingView({
   useEffect(() => {
     const initializeSets = async () => {
       const newSets: { [exerciseName: string]: WorkoutSet[] } = {}
+      setLoadingExercises(new Set(exercises))
 
+      // One request for every exercise in the template
+      const latestSets = await fetchLatestSetsBatch(exercises)
       for (const exerciseName of exercises) {
-        setLoadingExercises((prev) => new Set(prev).add(exerciseName))
-
-        const historicalSets = await fetchLatestSets(exerciseName)
         const definition = definitions.find((d) => d.name === exerciseName)
-        newSets[exerciseName] = createExerciseSets(exerciseName, definition, historicalSets)
-
-        setLoadingExercises((prev) => {
-          const updated = new Set(prev)
-          updated.delete(exerciseName)
-          return updated
-        })
+        newSets[exerciseName] = createExerciseSets(
+          exerciseName,
+          definition,
+          latestSets[exerciseName] || []
+        )
       }
 
+      setLoadingExercises(new Set())
       setSets(newSets)
     }
 
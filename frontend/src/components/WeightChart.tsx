@@ -4,75 +4,34 @@
 
 import { useState, useMemo } from 'react'
 import { LineChart, Line, XAxis, YAxis, Tooltip, ResponsiveContainer } from 'recharts'
-import { Session } from '../api/types'
+import { useChartedExercises, useExerciseSeries } from '../hooks/useStats'
 
-interface WeightChartProps {
-  sessions: Session[]
-}
-
-export default function WeightChart({ sessions }: WeightChartProps) {
-  // Extract unique exercises with logged weight (metric1_value !== null)
-  const exercises = useMemo(() => {
-    const set = new Set<string>()
-    sessions.forEach((session) => {
-      session.sets.forEach((set_) => {
-        if (set_.metric1_value !== null) {
-          set.add(set_.exercise)
-        }
-      })
-    })
-    return Array.from(set).sort()
-  }, [sessions])
-
-  // Default to first exercise or empty
-  const [selectedExercise, setSelectedExercise] = useState<string>(exercises[0] || '')
+export default function WeightChart() {
+  // Exercises with numeric weight data (metric1), computed server-side
+  const { data: exercises = [] } = useChartedExercises()
 
-  // Compute chart data when exercise changes
-  const chartData = useMemo(() => {
-    if (!selectedExercise) return []
+  // Default to first exercise until the user picks one
+  const [selectedId, setSelectedId] = useState<number | null>(null)
+  const exerciseId = selectedId ?? exercises[0]?.id ?? null
 
-    // Find sessions containing the selected exercise with metric1_value !== null
-    const relevantSessions = sessions
-      .filter((session) =>
-        session.sets.some(
-          (set_) => set_.exercise === selectedExercise && set_.metric1_value !== null
-        )
-      )
-      .map((session) => {
-        const maxWeight = Math.max(
-          ...session.sets
-            .filter((set_) => set_.exercise === selectedExercise && set_.metric1_value !== null)
-            .map((set_) => parseFloat(set_.metric1_value as string))
-        )
-        return {
-          date: session.date.split('T')[0], // YYYY-MM-DD
-          fullDate: new Date(session.date).toLocaleDateString('en-US', {
-            weekday: 'short',
-            month: 'short',
-            day: 'numeric',
-          }),
-          value: maxWeight,
-        }
-      })
+  // Max weight per date, aggregated in SQL
+  const { data: series } = useExerciseSeries(exerciseId)
 
-    // Sort ascending by date (API returns DESC)
-    relevantSessions.sort((a, b) => new Date(a.date).getTime() - new Date(b.date).getTime())
-
-    return relevantSessions
-  }, [sessions, selectedExercise])
+  const chartData = useMemo(
+    () =>
+      (series?.points ?? []).map((point) => ({
+        date: point.date,
+        fullDate: new Date(`${point.date}T00:00:00`).toLocaleDateString('en-US', {
+          weekday: 'short',
+          month: 'short',
+          day: 'numeric',
+        }),
+        value: point.value,
+      })),
+    [series]
+  )
 
-  // Get the unit for the selected exercise (from first relevant set)
-  const unit = useMemo(() => {
-    for (const session of sessions) {
-      const relevantSet = session.sets.find(
-        (set_) => set_.exercise === selectedExercise && set_.metric1_value !== null
-      )
-      if (relevantSet?.metric1_unit) {
-        return relevantSet.metric1_unit
-      }
-    }
-    return ''
-  }, [sessions, selectedExercise])
+  const unit = series?.unit ?? ''
 
   if (exercises.length === 0) {
     return <div className="weight-chart-placeholder">No weight data yet.</div>
@@ -82,13 +41,13 @@ export default function WeightChart({ sessions }: WeightChartProps) {
     <div className="weight-chart-container">
       <div className="weight-chart-select-wrapper">
         <select
-          value={selectedExercise}
-          onChange={(e) => setSelectedExercise(e.target.value)}
+          value={exerciseId ?? ''}
+          onChange={(e) => setSelectedId(Number(e.target.value))}
           className="weight-chart-select"
         >
           {exercises.map((ex) => (
-            <option key={ex} value={ex}>
-              {ex}
+            <option key={ex.id} value={ex.id}>
+              {ex.name}
             </option>
           ))}
         </select>
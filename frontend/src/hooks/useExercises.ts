@@ -2,8 +2,8 @@
  * TanStack Query hook for exercises
  */
 
-import { useQuery } from '@tanstack/react-query'
-import { fetchExercises } from '../api/client'
+import { keepPreviousData, useQuery } from '@tanstack/react-query'
+import { fetchExercises, searchExercises } from '../api/client'
 import { Exercise } from '../api/types'
 
 export function useExercises() {
@@ -12,3 +12,13 @@ export function useExercises() {
     queryFn: fetchExercises,
   })
 }
+
+export function useExerciseSearch(query: string, categoryTypes: string[] = []) {
+  const trimmed = query.trim()
+  return useQuery<Exercise[], Error>({
+    queryKey: ['exercise-search', trimmed, categoryTypes],
+    queryFn: () => searchExercises(trimmed, categoryTypes),
+    enabled: trimmed !== '',
+    placeholderData: keepPreviousData,
+  })
+}
@@ -0,0 +1,29 @@
+/**
+ * TanStack Query hooks for server-computed stats
+ */
+
+import { useQuery } from '@tanstack/react-query'
+import { fetchChartedExercises, fetchExerciseSeries, fetchHeatmap } from '../api/client'
+import { ChartedExercise, ExerciseSeries } from '../api/types'
+
+export function useHeatmap(year: number) {
+  return useQuery<Record<string, number>, Error>({
+    queryKey: ['heatmap', year],
+    queryFn: () => fetchHeatmap(year),
+  })
+}
+
+export function useChartedExercises() {
+  return useQuery<ChartedExercise[], Error>({
+    queryKey: ['charted-exercises'],
+    queryFn: fetchChartedExercises,
+  })
+}
+
+export function useExerciseSeries(exerciseId: number | null) {
+  return useQuery<ExerciseSeries | null, Error>({
+    queryKey: ['exercise-series', exerciseId],
+    queryFn: () => fetchExerciseSeries(exerciseId as number),
+    enabled: exerciseId !== null,
+  })
+}
@@ -8,6 +8,7 @@ import CalendarGrid from '../components/CalendarGrid'
 import ContributionGraph from '../components/ContributionGraph'
 import WeightChart from '../components/WeightChart'
 import { useSessions } from '../hooks/useSessions'
+import { useHeatmap } from '../hooks/useStats'
 import '../styles/dashboard.css'
 
 export default function Home() {
@@ -17,6 +18,7 @@ export default function Home() {
   const [selectedMonth, setSelectedMonth] = useState(new Date().getMonth())
   const [selectedYear, setSelectedYear] = useState(new Date().getFullYear())
   const [graphYear, setGraphYear] = useState(new Date().getFullYear())
+  const { data: heatmapCounts = {} } = useHeatmap(graphYear)
 
   const handleDaySelect = (day: number) => {
     navigate('/history', { state: { month: selectedMonth, year: selectedYear, day } })
@@ -42,7 +44,7 @@ export default function Home() {
 
       <div className="widget-card">
         <h2>Activity</h2>
-        <ContributionGraph sessions={sessions} year={graphYear} onYearChange={setGraphYear} />
+        <ContributionGraph counts={heatmapCounts} year={graphYear} onYearChange={setGraphYear} />
       </div>
 
       <div className="dashboard-bottom-row">
@@ -57,7 +59,7 @@ export default function Home() {
 
         <div className="widget-card">
           <h2>Weight Progress</h2>
-          <WeightChart sessions={sessions} />
+          <WeightChart />
         </div>
       </div>
     </div>